@@ -4,20 +4,17 @@ Example script demonstrating the Binance Futures Order Bot functionality
 This script shows basic usage examples for different order types
 """
 
-import os
 import sys
-from src.api_client import BinanceClient
-from src.market_orders import MarketOrderManager
-from src.limit_orders import LimitOrderManager
-from src.advanced.oco import OCOOrderManager
-from src.advanced.twap import TWAPManager
-from src.advanced.grid_orders import GridOrderManager
-from src.logger import logger
 
 def main():
     """Main example function"""
     print("=== Binance Futures Order Bot - Example Usage ===\n")
     
+    # Imported here so that importing this module stays cheap
+    from src.api_client import BinanceClient
+    from src.logger import logger
+    
+    client = None
     try:
         # Initialize the bot
         client = BinanceClient()
@@ -90,6 +87,9 @@ def main():
         print("2. Installed dependencies: pip install -r requirements.txt")
         print("3. Have a valid Binance Futures account")
         sys.exit(1)
+    finally:
+        if client is not None:
+            client.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -5,17 +5,77 @@ Handles grid order placement, execution, and management for automated buy-low/se
 
 import time
 import math
-from typing import Dict, Any, Optional, List
+import queue
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
+from decimal import Decimal
 from src.config import config, SIDE_TYPES, ORDER_TYPES
 from src.logger import logger
 from src.validator import validator, ValidationError
 from src.api_client import BinanceClient
 from src.limit_orders import LimitOrder
 
+def _close_price_stats(klines: List[list]) -> Tuple[float, float, float, float]:
+    """
+    Single pass over kline close prices
+    
+    Returns:
+        (min_price, max_price, last_price, rms of period-over-period returns)
+    """
+    previous = float(klines[0][4])
+    min_price = max_price = previous
+    total = 0.0
+    for kline in klines[1:]:
+        price = float(kline[4])
+        if price < min_price:
+            min_price = price
+        elif price > max_price:
+            max_price = price
+        change = (price - previous) / previous
+        total += change * change
+        previous = price
+    return min_price, max_price, previous, (total / (len(klines) - 1)) ** 0.5
+
+@lru_cache(maxsize=256)
+def _grid_prices(upper_price: float, lower_price: float, grid_number: int, grid_type: str) -> Tuple[float, ...]:
+    """Grid level prices from lower to upper, endpoints pinned exactly (like linspace/geomspace)"""
+    if grid_type == "arithmetic":
+        price_step = (upper_price - lower_price) / (grid_number - 1)
+        grid_prices = [lower_price + i * price_step for i in range(grid_number - 1)]
+    elif grid_type == "geometric":
+        ratio = (upper_price / lower_price) ** (1 / (grid_number - 1))
+        grid_prices = [lower_price]
+        for _ in range(grid_number - 2):
+            grid_prices.append(grid_prices[-1] * ratio)
+    else:
+        raise ValidationError("Grid type must be 'arithmetic' or 'geometric'")
+    grid_prices.append(upper_price)
+    return tuple(grid_prices)
+
+def _snap_to_ticks(prices: List[float], tick_size: str) -> List[int]:
+    """Round prices to the nearest whole number of exchange ticks"""
+    tick = Decimal(tick_size)
+    return [int((Decimal(repr(price)) / tick).to_integral_value()) for price in prices]
+
+def _floor_to_step(quantity: float, step_size: str) -> float:
+    """Round a quantity down to a multiple of the exchange lot step"""
+    step = Decimal(step_size)
+    return float((Decimal(repr(quantity)) // step) * step)
+
+def _iso(timestamp_ns: int) -> str:
+    """Format a time.time_ns() timestamp as a local ISO-8601 string"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9).isoformat()
+
 class GridOrder:
     """Grid order implementation for automated buy-low/sell-high strategies"""
     
+    # Seconds between REST checks of the placed orders while monitoring
+    RECONCILE_INTERVAL = 30
+    
+    # How long monitoring waits for the fill stream to connect before the first REST check
+    STREAM_CONNECT_TIMEOUT = 5
+    
     def __init__(self, client: BinanceClient):
         self.client = client
         self.limit_order = LimitOrder(client)
@@ -57,40 +117,37 @@ class GridOrder:
                 raise ValidationError("Total investment must be positive")
             
             # Calculate grid levels
-            if grid_type == "arithmetic":
-                price_step = (upper_price - lower_price) / (grid_number - 1)
-                grid_prices = [lower_price + i * price_step for i in range(grid_number)]
-            elif grid_type == "geometric":
-                ratio = (upper_price / lower_price) ** (1 / (grid_number - 1))
-                grid_prices = [lower_price * (ratio ** i) for i in range(grid_number)]
-            else:
-                raise ValidationError("Grid type must be 'arithmetic' or 'geometric'")
+            grid_prices = list(_grid_prices(upper_price, lower_price, grid_number, grid_type))
+            
+            # Snap levels to the exchange tick size once, as integer tick counts
+            tick_size, step_size = self._quantization_sizes(symbol.upper())
+            if tick_size:
+                price_ticks = _snap_to_ticks(grid_prices, tick_size)
+                if any(low >= high for low, high in zip(price_ticks, price_ticks[1:])):
+                    raise ValidationError(f"Grid levels are closer together than the tick size ({tick_size})")
+                tick = Decimal(tick_size)
+                grid_prices = [float(ticks * tick) for ticks in price_ticks]
             
             # Calculate investment per grid level
             investment_per_grid = total_investment / grid_number
             
-            # Create grid orders
+            # Create grid orders: buy at each level, sell at the next one up
             grid_orders = []
-            for i in range(grid_number - 1):
-                # Buy order at current level
-                buy_price = grid_prices[i]
+            for level, (buy_price, sell_price) in enumerate(zip(grid_prices, grid_prices[1:]), 1):
                 buy_quantity = investment_per_grid / buy_price
-                
-                # Sell order at next level
-                sell_price = grid_prices[i + 1]
-                sell_quantity = buy_quantity  # Same quantity for sell
-                
-                grid_level = {
-                    "level": i + 1,
+                if step_size:
+                    buy_quantity = _floor_to_step(buy_quantity, step_size)
+                    if buy_quantity <= 0:
+                        raise ValidationError(f"Investment per level is below the lot step ({step_size})")
+                grid_orders.append({
+                    "level": level,
                     "buy_price": buy_price,
                     "buy_quantity": buy_quantity,
                     "sell_price": sell_price,
-                    "sell_quantity": sell_quantity,
+                    "sell_quantity": buy_quantity,  # Same quantity for sell
                     "investment": investment_per_grid,
                     "potential_profit": (sell_price - buy_price) * buy_quantity
-                }
-                
-                grid_orders.append(grid_level)
+                })
             
             grid_strategy = {
                 "symbol": symbol,
@@ -101,7 +158,7 @@ class GridOrder:
                 "total_investment": total_investment,
                 "grid_prices": grid_prices,
                 "grid_orders": grid_orders,
-                "created_at": datetime.now().isoformat(),
+                "created_at": _iso(time.time_ns()),
                 "status": "created"
             }
             
@@ -134,6 +191,71 @@ class GridOrder:
         Returns:
             Grid execution results
         """
+        return self.execute_grid_strategies([grid_strategy], auto_rebalance, max_concurrent_orders)[0]
+    
+    def execute_grid_strategies(self, 
+                              grid_strategies: List[Dict[str, Any]],
+                              auto_rebalance: bool = True,
+                              max_concurrent_orders: int = 5) -> List[Dict[str, Any]]:
+        """
+        Execute several grid trading strategies, monitored together from one loop
+        
+        Args:
+            grid_strategies: Grid strategy configurations (may span symbols)
+            auto_rebalance: Whether to automatically rebalance the grids
+            max_concurrent_orders: Maximum number of concurrent orders per grid
+            
+        Returns:
+            Grid execution results, one per strategy
+        """
+        running = []
+        for grid_strategy in grid_strategies:
+            execution_results, start_ns = self._place_grid_orders(grid_strategy, max_concurrent_orders)
+            running.append((grid_strategy, execution_results, start_ns // 1_000_000))
+        
+        # Monitor and manage grid orders
+        if auto_rebalance:
+            self._monitor_and_rebalance_grid(running)
+        
+        for _, execution_results, _ in running:
+            execution_results["status"] = "completed"
+            execution_results["execution_end"] = _iso(time.time_ns())
+            
+            # Log grid execution completion
+            logger.log_strategy_event("Grid", "execution_completed", {
+                "symbol": execution_results["symbol"],
+                "total_profit": execution_results["total_profit"],
+                "executed_orders": len(execution_results["executed_orders"])
+            })
+        
+        return [execution_results for _, execution_results, _ in running]
+    
+    def _quantization_sizes(self, symbol: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Exchange tick size and lot step for symbol, as strings
+        
+        Either is None when the exchange info doesn't provide it (or can't be fetched);
+        that value is then left unquantized, with a warning, instead of failing the grid.
+        """
+        try:
+            filters = self.client.get_symbol_filters(symbol)
+        except Exception as e:
+            logger.log_error(e, f"Failed to fetch exchange filters for {symbol}")
+            filters = {}
+        
+        tick_size = filters.get("PRICE_FILTER", {}).get("tickSize")
+        step_size = filters.get("LOT_SIZE", {}).get("stepSize")
+        
+        missing = [name for name, size in (("tickSize", tick_size), ("stepSize", step_size)) if not size]
+        if missing:
+            logger.logger.warning("No %s for %s; grid prices/quantities are not snapped and "
+                                  "the exchange may reject them (-1013)", " or ".join(missing), symbol)
+        return tick_size, step_size
+    
+    def _place_grid_orders(self, 
+                         grid_strategy: Dict[str, Any],
+                         max_concurrent_orders: int) -> Tuple[Dict[str, Any], int]:
+        """Place the initial orders of a grid, returning its execution results and start time (ns)"""
         try:
             symbol = grid_strategy["symbol"]
             grid_orders = grid_strategy["grid_orders"]
@@ -149,146 +271,240 @@ class GridOrder:
                 "grid_levels": len(grid_orders)
             })
             
+            # Single clock read for the start; formatted once for the results
+            start_ns = time.time_ns()
+            
             execution_results = {
                 "symbol": symbol,
                 "current_price": current_price,
-                "execution_start": datetime.now().isoformat(),
+                "execution_start": _iso(start_ns),
                 "placed_orders": [],
                 "executed_orders": [],
                 "total_profit": 0,
                 "status": "executing"
             }
             
-            # Place initial grid orders
-            placed_orders = []
+            # Build the initial grid orders in memory, capped at max_concurrent_orders.
+            # Each level is validated here so one bad level is skipped instead of failing the batch
+            pending_orders = []
             for grid_level in grid_orders:
                 try:
                     # Place buy order if current price is above buy price
                     if current_price > grid_level["buy_price"]:
-                        buy_order = self.limit_order.place_limit_buy_order(
-                            symbol, grid_level["buy_quantity"], grid_level["buy_price"]
-                        )
-                        placed_orders.append({
-                            "grid_level": grid_level["level"],
-                            "order_type": "buy",
-                            "order_id": buy_order.get("orderId"),
-                            "price": grid_level["buy_price"],
-                            "quantity": grid_level["buy_quantity"]
-                        })
+                        pending_orders.append((grid_level["level"], "buy", SIDE_TYPES["BUY"],
+                                               validator.validate_price(grid_level["buy_price"]),
+                                               validator.validate_quantity(grid_level["buy_quantity"])))
                     
                     # Place sell order if current price is below sell price
                     if current_price < grid_level["sell_price"]:
-                        sell_order = self.limit_order.place_limit_sell_order(
-                            symbol, grid_level["sell_quantity"], grid_level["sell_price"]
-                        )
-                        placed_orders.append({
-                            "grid_level": grid_level["level"],
-                            "order_type": "sell",
-                            "order_id": sell_order.get("orderId"),
-                            "price": grid_level["sell_price"],
-                            "quantity": grid_level["sell_quantity"]
-                        })
-                    
-                    # Limit concurrent orders
-                    if len(placed_orders) >= max_concurrent_orders:
-                        break
+                        pending_orders.append((grid_level["level"], "sell", SIDE_TYPES["SELL"],
+                                               validator.validate_price(grid_level["sell_price"]),
+                                               validator.validate_quantity(grid_level["sell_quantity"])))
                         
                 except Exception as e:
                     logger.log_error(e, f"Grid order placement failed for level {grid_level['level']}")
+                
+                # Limit concurrent orders
+                if len(pending_orders) >= max_concurrent_orders:
+                    break
+            pending_orders = pending_orders[:max_concurrent_orders]
             
-            execution_results["placed_orders"] = placed_orders
-            
-            # Monitor and manage grid orders
-            if auto_rebalance:
-                self._monitor_and_rebalance_grid(grid_strategy, execution_results)
+            # Submit them through the batch endpoint
+            responses = self.limit_order.place_batch_limit_orders([
+                {"symbol": symbol, "side": side, "quantity": quantity, "price": price}
+                for _, _, side, price, quantity in pending_orders
+            ])
             
-            execution_results["status"] = "completed"
-            execution_results["execution_end"] = datetime.now().isoformat()
+            placed_orders = []
+            for (level, order_type, _, price, quantity), response in zip(pending_orders, responses):
+                if "orderId" not in response:
+                    logger.logger.error(f"Grid order placement failed for level {level}: {response.get('msg')}")
+                    continue
+                
+                placed_orders.append({
+                    "grid_level": level,
+                    "order_type": order_type,
+                    "order_id": response["orderId"],
+                    "price": price,
+                    "quantity": quantity
+                })
             
-            # Log grid execution completion
-            logger.log_strategy_event("Grid", "execution_completed", {
-                "total_profit": execution_results["total_profit"],
-                "executed_orders": len(execution_results["executed_orders"])
-            })
+            execution_results["placed_orders"] = placed_orders
             
-            return execution_results
+            return execution_results, start_ns
             
         except Exception as e:
             logger.log_error(e, f"Grid strategy execution failed for {symbol}")
             raise
     
-    def _monitor_and_rebalance_grid(self, 
-                                  grid_strategy: Dict[str, Any],
-                                  execution_results: Dict[str, Any]) -> None:
-        """Monitor grid orders and rebalance as needed"""
+    def _monitor_and_rebalance_grid(self, running_grids: List[Tuple[Dict[str, Any], Dict[str, Any], int]]) -> None:
+        """
+        Monitor grid orders and rebalance as needed
+        
+        Args:
+            running_grids: (grid_strategy, execution_results, history_start_ms) per grid,
+                           where history_start_ms is when that grid's placement began
+        """
+        symbols = {grid_strategy["symbol"] for grid_strategy, _, _ in running_grids}
         try:
-            symbol = grid_strategy["symbol"]
-            grid_orders = grid_strategy["grid_orders"]
-            
             # Monitor for a reasonable time period
             monitoring_duration = 3600  # 1 hour
-            start_time = time.time()
+            deadline = time.time() + monitoring_duration
             
-            while time.time() - start_time < monitoring_duration:
-                # Check for filled orders
-                open_orders = self.client.get_open_orders(symbol)
-                
+            # Orders already resolved (filled or otherwise closed) are not handled twice
+            processed = [set() for _ in running_grids]
+            placed_by_key = {}
+            for index, (grid_strategy, execution_results, _) in enumerate(running_grids):
                 for placed_order in execution_results["placed_orders"]:
-                    order_id = placed_order["order_id"]
-                    
-                    # Check if order is still open
-                    if not any(order["orderId"] == order_id for order in open_orders):
-                        # Order was filled, get execution details
-                        order_status = self.client.get_order(symbol, order_id)
-                        
-                        if order_status.get("status") == "FILLED":
-                            executed_quantity = float(order_status.get("executedQty", 0))
-                            executed_price = float(order_status.get("avgPrice", 0))
-                            
-                            # Calculate profit/loss
-                            grid_level = placed_order["grid_level"]
-                            if placed_order["order_type"] == "buy":
-                                # Buy order filled, place corresponding sell order
-                                sell_price = grid_orders[grid_level - 1]["sell_price"]
-                                sell_order = self.limit_order.place_limit_sell_order(
-                                    symbol, executed_quantity, sell_price
-                                )
-                                
-                                execution_results["executed_orders"].append({
-                                    "grid_level": grid_level,
-                                    "buy_order_id": order_id,
-                                    "buy_price": executed_price,
-                                    "buy_quantity": executed_quantity,
-                                    "sell_order_id": sell_order.get("orderId"),
-                                    "sell_price": sell_price,
-                                    "potential_profit": (sell_price - executed_price) * executed_quantity
-                                })
-                            else:
-                                # Sell order filled, place corresponding buy order
-                                buy_price = grid_orders[grid_level - 1]["buy_price"]
-                                buy_order = self.limit_order.place_limit_buy_order(
-                                    symbol, executed_quantity, buy_price
-                                )
-                                
-                                # Calculate realized profit
-                                profit = (executed_price - buy_price) * executed_quantity
-                                execution_results["total_profit"] += profit
-                                
-                                execution_results["executed_orders"].append({
-                                    "grid_level": grid_level,
-                                    "sell_order_id": order_id,
-                                    "sell_price": executed_price,
-                                    "sell_quantity": executed_quantity,
-                                    "buy_order_id": buy_order.get("orderId"),
-                                    "buy_price": buy_price,
-                                    "realized_profit": profit
-                                })
+                    placed_by_key[(grid_strategy["symbol"], placed_order["order_id"])] = (index, placed_order)
+            
+            # Fills pushed by the shared user data stream are handled as they arrive; a periodic
+            # REST reconcile runs alongside it to catch fills the stream missed (before it
+            # connected, or while it was reconnecting) and stands in for it if unavailable
+            fills = queue.Queue()
+            
+            def listener(order: Dict[str, Any]):
+                if order.get("s") in symbols and order.get("X") == "FILLED":
+                    fills.put(order)
+            
+            stream = self._acquire_fill_stream(symbols, listener)
+            
+            try:
+                if stream is not None:
+                    stream.wait_connected(self.STREAM_CONNECT_TIMEOUT)
                 
-                # Wait before next check
-                time.sleep(30)  # Check every 30 seconds
+                next_reconcile = time.monotonic()
+                while time.time() < deadline:
+                    if time.monotonic() >= next_reconcile:
+                        for (grid_strategy, execution_results, history_start_ms), done in zip(running_grids, processed):
+                            self._reconcile_grid_fills(grid_strategy, execution_results, done, history_start_ms)
+                        next_reconcile = time.monotonic() + self.RECONCILE_INTERVAL
+                    
+                    wait = min(deadline - time.time(), next_reconcile - time.monotonic())
+                    try:
+                        order = fills.get(timeout=max(wait, 0))
+                    except queue.Empty:
+                        continue
+                    
+                    order_id = order["i"]
+                    entry = placed_by_key.get((order["s"], order_id))
+                    if entry is not None and order_id not in processed[entry[0]]:
+                        index, placed_order = entry
+                        processed[index].add(order_id)
+                        grid_strategy, execution_results, _ = running_grids[index]
+                        self._handle_filled_order(
+                            grid_strategy, execution_results, placed_order,
+                            float(order["z"]), float(order["ap"])
+                        )
+            finally:
+                if stream is not None:
+                    stream.release(listener)
                 
         except Exception as e:
-            logger.log_error(e, f"Grid monitoring failed for {symbol}")
+            logger.log_error(e, f"Grid monitoring failed for {', '.join(sorted(symbols))}")
+    
+    def _acquire_fill_stream(self, symbols: set, listener):
+        """Acquire the account's shared user data stream with listener registered, or None on failure"""
+        try:
+            from src.user_stream import UserDataStream
+            
+            return UserDataStream.acquire(self.client, listener)
+        except Exception as e:
+            logger.log_error(e, f"User data stream unavailable for {', '.join(sorted(symbols))}, falling back to polling")
+            return None
+    
+    def _reconcile_grid_fills(self, 
+                            grid_strategy: Dict[str, Any],
+                            execution_results: Dict[str, Any],
+                            processed: set,
+                            history_start_ms: int) -> None:
+        """Check placed grid orders over REST and rebalance the ones that filled"""
+        symbol = grid_strategy["symbol"]
+        
+        # Check for filled orders
+        open_orders = self.client.get_open_orders(symbol)
+        open_ids = {order["orderId"] for order in open_orders}
+        
+        closed_orders = []
+        for placed_order in execution_results["placed_orders"]:
+            order_id = placed_order["order_id"]
+            if order_id not in open_ids and order_id not in processed:
+                closed_orders.append(placed_order)
+        
+        # Fetch execution details for all closed orders in one request
+        orders_by_id = {}
+        if closed_orders:
+            order_history = self.client.get_order_history(symbol, limit=1000, start_time=history_start_ms)
+            orders_by_id = {order["orderId"]: order for order in order_history}
+        
+        for placed_order in closed_orders:
+            order_id = placed_order["order_id"]
+            
+            # Order left the book, get execution details
+            order_status = orders_by_id.get(order_id)
+            if order_status is None:
+                order_status = self.client.get_order(symbol, order_id)
+            status_get = order_status.get
+            status = status_get("status")
+            
+            if status not in ("NEW", "PARTIALLY_FILLED"):
+                processed.add(order_id)
+            
+            if status == "FILLED":
+                self._handle_filled_order(
+                    grid_strategy, execution_results, placed_order,
+                    float(status_get("executedQty", 0)), float(status_get("avgPrice", 0))
+                )
+    
+    def _handle_filled_order(self, 
+                           grid_strategy: Dict[str, Any],
+                           execution_results: Dict[str, Any],
+                           placed_order: Dict[str, Any],
+                           executed_quantity: float,
+                           executed_price: float) -> None:
+        """Place the counter order for a filled grid order and record the result"""
+        symbol = grid_strategy["symbol"]
+        order_id = placed_order["order_id"]
+        grid_level = placed_order["grid_level"]
+        level_config = grid_strategy["grid_orders"][grid_level - 1]
+        
+        # Calculate profit/loss
+        if placed_order["order_type"] == "buy":
+            # Buy order filled, place corresponding sell order
+            sell_price = level_config["sell_price"]
+            sell_order = self.limit_order.place_limit_sell_order(
+                symbol, executed_quantity, sell_price
+            )
+            
+            execution_results["executed_orders"].append({
+                "grid_level": grid_level,
+                "buy_order_id": order_id,
+                "buy_price": executed_price,
+                "buy_quantity": executed_quantity,
+                "sell_order_id": sell_order.get("orderId"),
+                "sell_price": sell_price,
+                "potential_profit": (sell_price - executed_price) * executed_quantity
+            })
+        else:
+            # Sell order filled, place corresponding buy order
+            buy_price = level_config["buy_price"]
+            buy_order = self.limit_order.place_limit_buy_order(
+                symbol, executed_quantity, buy_price
+            )
+            
+            # Calculate realized profit
+            profit = (executed_price - buy_price) * executed_quantity
+            execution_results["total_profit"] += profit
+            
+            execution_results["executed_orders"].append({
+                "grid_level": grid_level,
+                "sell_order_id": order_id,
+                "sell_price": executed_price,
+                "sell_quantity": executed_quantity,
+                "buy_order_id": buy_order.get("orderId"),
+                "buy_price": buy_price,
+                "realized_profit": profit
+            })
     
     def create_martingale_grid(self, 
                              symbol: str, 
@@ -321,9 +537,13 @@ class GridOrder:
             grid_orders = []
             price_step = base_price * 0.01  # 1% price step
             
+            # Geometric series 1 + m + ... + m^(N-1) in closed form (m > 1 is enforced above)
+            weight_total = (multiplier ** grid_number - 1.0) / (multiplier - 1.0)
+            weight = 1.0
+            
             for i in range(grid_number):
                 # Calculate position size with multiplier
-                position_size = total_investment * (multiplier ** i) / sum(multiplier ** j for j in range(grid_number))
+                position_size = total_investment * weight / weight_total
                 
                 # Calculate grid prices
                 buy_price = base_price - (i * price_step)
@@ -339,10 +559,11 @@ class GridOrder:
                     "sell_price": sell_price,
                     "sell_quantity": sell_quantity,
                     "investment": position_size,
-                    "multiplier": multiplier ** i
+                    "multiplier": weight
                 }
                 
                 grid_orders.append(grid_level)
+                weight *= multiplier
             
             grid_strategy = {
                 "symbol": symbol,
@@ -352,7 +573,7 @@ class GridOrder:
                 "total_investment": total_investment,
                 "grid_orders": grid_orders,
                 "grid_type": "martingale",
-                "created_at": datetime.now().isoformat(),
+                "created_at": _iso(time.time_ns()),
                 "status": "created"
             }
             
@@ -397,14 +618,7 @@ class GridOrderManager:
                 raise ValidationError("Insufficient price data for volatility calculation")
             
             # Calculate price range and volatility
-            prices = [float(kline[4]) for kline in klines]  # Close prices
-            min_price = min(prices)
-            max_price = max(prices)
-            current_price = prices[-1]
-            
-            # Calculate volatility
-            returns = [(prices[i] - prices[i-1]) / prices[i-1] for i in range(1, len(prices))]
-            volatility = (sum(r*r for r in returns) / len(returns)) ** 0.5
+            min_price, max_price, current_price, volatility = _close_price_stats(klines)
             
             # Adjust grid parameters based on volatility
             if volatility > 0.05:  # High volatility
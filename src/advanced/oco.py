@@ -4,12 +4,71 @@ Handles OCO order placement, execution, and management
 """
 
 import time
-from typing import Dict, Any, Optional
+import logging
+from typing import Dict, Any, Optional, List, Tuple
 from src.config import config, SIDE_TYPES, TIME_IN_FORCE
 from src.logger import logger
 from src.validator import validator, ValidationError
 from src.api_client import BinanceClient
 
+# Validator methods bound once at import for the order placement hot path
+_validate_symbol = validator.validate_symbol
+_validate_side = validator.validate_side
+_validate_quantity = validator.validate_quantity
+_validate_price = validator.validate_price
+_validate_stop_price = validator.validate_stop_price
+_validate_time_in_force = validator.validate_time_in_force
+
+# Side constants resolved once instead of per-call SIDE_TYPES lookups
+_BUY = SIDE_TYPES["BUY"]
+_SELL = SIDE_TYPES["SELL"]
+
+def _upper(value: str) -> str:
+    """Uppercase a string, returning it unchanged when it already is"""
+    return value if value.isupper() else value.upper()
+
+# API names of the optional OCO parameters, in place_oco_order argument order
+_OCO_OPTIONAL_PARAMS = (
+    "listClientOrderId", "limitClientOrderId", "stopClientOrderId",
+    "limitIcebergQty", "stopIcebergQty", "stopLimitIcebergQty",
+    "limitStrategyId", "stopStrategyId"
+)
+
+def _oco_level_prices(prices: List[float],
+                      take_profit_percentages: List[float],
+                      stop_loss_percentages: List[float],
+                      is_buy: bool) -> List[Tuple[float, float, float]]:
+    """
+    Take profit, stop loss and stop limit prices for each entry price
+    
+    For BUY the take profit sits above the entry and the stop below it, with the stop
+    limit 1% beyond the stop; SELL mirrors this. The side is resolved once, not per level.
+    """
+    if is_buy:
+        direction, stop_limit_factor = 1.0, 0.99
+    else:
+        direction, stop_limit_factor = -1.0, 1.01
+    
+    levels = []
+    for price, tp_pct, sl_pct in zip(prices, take_profit_percentages, stop_loss_percentages):
+        stop_loss_price = price * (1 - direction * sl_pct)
+        levels.append((price * (1 + direction * tp_pct), stop_loss_price, stop_loss_price * stop_limit_factor))
+    return levels
+
+def _risk_reward_prices(entry_price: float,
+                        stop_loss_price: float,
+                        risk_reward_ratio: float,
+                        is_buy: bool) -> Tuple[float, float, float]:
+    """Take profit, stop loss and stop limit prices for a risk-reward ratio"""
+    if is_buy:
+        direction, stop_limit_factor = 1.0, 0.99
+    else:
+        direction, stop_limit_factor = -1.0, 1.01
+    
+    risk = direction * (entry_price - stop_loss_price)
+    return (entry_price + direction * risk * risk_reward_ratio,
+            stop_loss_price, stop_loss_price * stop_limit_factor)
+
 class OCOOrder:
     """OCO (One-Cancels-the-Other) order implementation"""
     
@@ -57,53 +116,20 @@ class OCOOrder:
         """
         try:
             # Validate inputs
-            validator.validate_symbol(symbol)
-            validator.validate_side(side)
-            quantity = validator.validate_quantity(quantity)
-            price = validator.validate_price(price)
-            stop_price = validator.validate_stop_price(stop_price)
-            stop_limit_price = validator.validate_price(stop_limit_price)
-            validator.validate_time_in_force(stop_limit_time_in_force)
-            
-            # Prepare OCO order parameters
-            oco_params = {
-                "symbol": symbol.upper(),
-                "side": side.upper(),
-                "quantity": quantity,
-                "price": price,
-                "stopPrice": stop_price,
-                "stopLimitPrice": stop_limit_price,
-                "stopLimitTimeInForce": stop_limit_time_in_force.upper()
-            }
-            
-            # Add optional parameters if provided
-            if list_client_order_id:
-                oco_params["listClientOrderId"] = list_client_order_id
-            if limit_client_order_id:
-                oco_params["limitClientOrderId"] = limit_client_order_id
-            if stop_client_order_id:
-                oco_params["stopClientOrderId"] = stop_client_order_id
-            if limit_iceberg_qty:
-                oco_params["limitIcebergQty"] = limit_iceberg_qty
-            if stop_iceberg_qty:
-                oco_params["stopIcebergQty"] = stop_iceberg_qty
-            if stop_limit_iceberg_qty:
-                oco_params["stopLimitIcebergQty"] = stop_limit_iceberg_qty
-            if limit_strategy_id:
-                oco_params["limitStrategyId"] = limit_strategy_id
-            if stop_strategy_id:
-                oco_params["stopStrategyId"] = stop_strategy_id
-            
-            # Log the OCO order attempt
-            logger.logger.info(f"Placing OCO order: {symbol} {side} {quantity} @ {price} (stop: {stop_price})")
+            _validate_symbol(symbol)
+            _validate_side(side)
+            quantity = _validate_quantity(quantity)
+            price = _validate_price(price)
+            stop_price = _validate_stop_price(stop_price)
+            stop_limit_price = _validate_price(stop_limit_price)
+            _validate_time_in_force(stop_limit_time_in_force)
             
-            # Place the OCO order
-            response = self.client.place_oco_order(oco_params)
-            
-            # Log successful OCO order placement
-            logger.log_order_placed(oco_params, response.get('orderListId', 'unknown'))
-            
-            return response
+            return self._place_oco_unvalidated(
+                symbol, side, quantity, price, stop_price, stop_limit_price,
+                stop_limit_time_in_force, list_client_order_id, limit_client_order_id,
+                stop_client_order_id, limit_iceberg_qty, stop_iceberg_qty,
+                stop_limit_iceberg_qty, limit_strategy_id, stop_strategy_id
+            )
             
         except ValidationError as e:
             logger.log_error(e, f"OCO order validation failed for {symbol}")
@@ -112,6 +138,55 @@ class OCOOrder:
             logger.log_error(e, f"OCO order placement failed for {symbol}")
             raise
     
+    def _place_oco_unvalidated(self,
+                               symbol: str,
+                               side: str,
+                               quantity: float,
+                               price: float,
+                               stop_price: float,
+                               stop_limit_price: float,
+                               stop_limit_time_in_force: str = "GTC",
+                               list_client_order_id: Optional[str] = None,
+                               limit_client_order_id: Optional[str] = None,
+                               stop_client_order_id: Optional[str] = None,
+                               limit_iceberg_qty: Optional[float] = None,
+                               stop_iceberg_qty: Optional[float] = None,
+                               stop_limit_iceberg_qty: Optional[float] = None,
+                               limit_strategy_id: Optional[int] = None,
+                               stop_strategy_id: Optional[int] = None) -> Dict[str, Any]:
+        """Build and send an OCO order whose inputs the caller has already validated"""
+        # Prepare OCO order parameters
+        oco_params = {
+            "symbol": _upper(symbol),
+            "side": _upper(side),
+            "quantity": quantity,
+            "price": price,
+            "stopPrice": stop_price,
+            "stopLimitPrice": stop_limit_price,
+            "stopLimitTimeInForce": _upper(stop_limit_time_in_force)
+        }
+        
+        # Add optional parameters if provided (values in _OCO_OPTIONAL_PARAMS order)
+        optional_values = (
+            list_client_order_id, limit_client_order_id, stop_client_order_id,
+            limit_iceberg_qty, stop_iceberg_qty, stop_limit_iceberg_qty,
+            limit_strategy_id, stop_strategy_id
+        )
+        oco_params.update(
+            (key, value) for key, value in zip(_OCO_OPTIONAL_PARAMS, optional_values) if value
+        )
+        
+        # Log the OCO order attempt
+        logger.logger.info("Placing OCO order: %s %s %s @ %s (stop: %s)", symbol, side, quantity, price, stop_price)
+        
+        # Place the OCO order
+        response = self.client.place_oco_order(oco_params)
+        
+        # Log successful OCO order placement
+        logger.log_order_placed(oco_params, response.get('orderListId', 'unknown'))
+        
+        return response
+    
     def place_oco_buy_order(self, 
                            symbol: str, 
                            quantity: float,
@@ -121,7 +196,7 @@ class OCOOrder:
                            **kwargs) -> Dict[str, Any]:
         """Place an OCO buy order (take profit + stop loss)"""
         return self.place_oco_order(
-            symbol, SIDE_TYPES["BUY"], quantity, 
+            symbol, _BUY, quantity, 
             take_profit_price, stop_loss_price, stop_limit_price, **kwargs
         )
     
@@ -134,7 +209,7 @@ class OCOOrder:
                             **kwargs) -> Dict[str, Any]:
         """Place an OCO sell order (take profit + stop loss)"""
         return self.place_oco_order(
-            symbol, SIDE_TYPES["SELL"], quantity, 
+            symbol, _SELL, quantity, 
             take_profit_price, stop_loss_price, stop_limit_price, **kwargs
         )
     
@@ -160,18 +235,19 @@ class OCOOrder:
         """
         try:
             # Validate inputs
-            validator.validate_symbol(symbol)
-            validator.validate_side(side)
-            quote_quantity = validator.validate_quantity(quote_quantity)
-            take_profit_price = validator.validate_price(take_profit_price)
-            stop_loss_price = validator.validate_stop_price(stop_loss_price)
-            stop_limit_price = validator.validate_price(stop_limit_price)
+            _validate_symbol(symbol)
+            _validate_side(side)
+            quote_quantity = _validate_quantity(quote_quantity)
+            take_profit_price = _validate_price(take_profit_price)
+            stop_loss_price = _validate_stop_price(stop_loss_price)
+            stop_limit_price = _validate_price(stop_limit_price)
+            _validate_time_in_force(kwargs.get("stop_limit_time_in_force", "GTC"))
             
             # Calculate quantity based on quote amount and take profit price
-            quantity = quote_quantity / take_profit_price
+            quantity = _validate_quantity(quote_quantity / take_profit_price)
             
-            # Place the OCO order
-            return self.place_oco_order(
+            # Place the OCO order (inputs are already validated above)
+            return self._place_oco_unvalidated(
                 symbol, side, quantity, 
                 take_profit_price, stop_loss_price, stop_limit_price, **kwargs
             )
@@ -189,7 +265,7 @@ class OCOOrder:
                               **kwargs) -> Dict[str, Any]:
         """Place an OCO buy order using USDT amount"""
         return self.place_oco_order_by_quote_quantity(
-            symbol, SIDE_TYPES["BUY"], usdt_amount,
+            symbol, _BUY, usdt_amount,
             take_profit_price, stop_loss_price, stop_limit_price, **kwargs
         )
     
@@ -202,7 +278,7 @@ class OCOOrder:
                                **kwargs) -> Dict[str, Any]:
         """Place an OCO sell order using USDT amount"""
         return self.place_oco_order_by_quote_quantity(
-            symbol, SIDE_TYPES["SELL"], usdt_amount,
+            symbol, _SELL, usdt_amount,
             take_profit_price, stop_loss_price, stop_limit_price, **kwargs
         )
 
@@ -232,15 +308,12 @@ class OCOOrderManager:
             current_price: Current market price
         """
         try:
+            is_buy = _upper(side) == _BUY
+            
             # Calculate prices based on percentages
-            if side == SIDE_TYPES["BUY"]:
-                take_profit_price = current_price * (1 + take_profit_percentage)
-                stop_loss_price = current_price * (1 - stop_loss_percentage)
-                stop_limit_price = stop_loss_price * 0.99  # Slightly below stop price
-            else:
-                take_profit_price = current_price * (1 - take_profit_percentage)
-                stop_loss_price = current_price * (1 + stop_loss_percentage)
-                stop_limit_price = stop_loss_price * 1.01  # Slightly above stop price
+            take_profit_price, stop_loss_price, stop_limit_price = _oco_level_prices(
+                [current_price], [take_profit_percentage], [stop_loss_percentage], is_buy
+            )[0]
             
             # Place OCO order
             return self.oco_order.place_oco_order(
@@ -271,19 +344,12 @@ class OCOOrderManager:
             stop_loss_price: Stop loss price
         """
         try:
-            # Calculate take profit based on risk-reward ratio
-            if side == SIDE_TYPES["BUY"]:
-                risk = entry_price - stop_loss_price
-                take_profit_price = entry_price + (risk * risk_reward_ratio)
-            else:
-                risk = stop_loss_price - entry_price
-                take_profit_price = entry_price - (risk * risk_reward_ratio)
+            is_buy = _upper(side) == _BUY
             
-            # Calculate stop limit price
-            if side == SIDE_TYPES["BUY"]:
-                stop_limit_price = stop_loss_price * 0.99
-            else:
-                stop_limit_price = stop_loss_price * 1.01
+            # Calculate take profit based on risk-reward ratio, and the stop limit price
+            take_profit_price, stop_loss_price, stop_limit_price = _risk_reward_prices(
+                entry_price, stop_loss_price, risk_reward_ratio, is_buy
+            )
             
             # Place OCO order
             return self.oco_order.place_oco_order(
@@ -314,31 +380,54 @@ class OCOOrderManager:
             stop_loss_percentages: List of stop loss percentages
         """
         try:
-            if len(price_levels) != len(take_profit_percentages) or len(price_levels) != len(stop_loss_percentages):
+            n = len(price_levels)
+            if n != len(take_profit_percentages) or n != len(stop_loss_percentages):
                 raise ValueError("All lists must have the same length")
+            if n == 0:
+                raise ValueError("At least one price level is required")
+            
+            quantity_per_order = _validate_quantity(total_quantity / n)
+            is_buy = _upper(side) == _BUY
             
-            quantity_per_order = total_quantity / len(price_levels)
-            orders = []
+            # Pass 1: compute and validate every level before any order is sent
+            levels = [
+                (_validate_price(take_profit_price),
+                 _validate_stop_price(stop_loss_price),
+                 _validate_price(stop_limit_price))
+                for take_profit_price, stop_loss_price, stop_limit_price in _oco_level_prices(
+                    price_levels, take_profit_percentages, stop_loss_percentages, is_buy
+                )
+            ]
             
-            for i, (price, tp_pct, sl_pct) in enumerate(zip(price_levels, take_profit_percentages, stop_loss_percentages)):
-                # Calculate take profit and stop loss prices
-                if side == SIDE_TYPES["BUY"]:
-                    take_profit_price = price * (1 + tp_pct)
-                    stop_loss_price = price * (1 - sl_pct)
-                    stop_limit_price = stop_loss_price * 0.99
-                else:
-                    take_profit_price = price * (1 - tp_pct)
-                    stop_loss_price = price * (1 + sl_pct)
-                    stop_limit_price = stop_loss_price * 1.01
-                
-                # Place OCO order
-                order = self.oco_order.place_oco_order(
+            # Pass 2: place the OCO orders concurrently on the client's shared pool
+            futures = [
+                self.client.executor.submit(
+                    self.oco_order.place_oco_order,
                     symbol, side, quantity_per_order,
                     take_profit_price, stop_loss_price, stop_limit_price
                 )
-                orders.append(order)
-                
-                logger.logger.info(f"Multiple OCO order {i+1} placed: {order.get('orderListId')}")
+                for take_profit_price, stop_loss_price, stop_limit_price in levels
+            ]
+            
+            # Wait for every level so one failure doesn't hide OCOs that were placed
+            orders, errors = [], []
+            for level, future in enumerate(futures, 1):
+                try:
+                    orders.append(future.result())
+                except Exception as e:
+                    errors.append((level, e))
+            
+            if errors:
+                placed_ids = [order.get('orderListId') for order in orders]
+                failed_levels = [level for level, _ in errors]
+                raise RuntimeError(
+                    f"OCO orders failed for levels {failed_levels} ({errors[0][1]}); "
+                    f"{len(orders)} of {n} were placed (order list IDs: {placed_ids})"
+                ) from errors[0][1]
+            
+            if logger.logger.isEnabledFor(logging.INFO):
+                for i, order in enumerate(orders, 1):
+                    logger.logger.info("Multiple OCO order %d placed: %s", i, order.get('orderListId'))
             
             return orders
             
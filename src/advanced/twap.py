@@ -3,22 +3,146 @@ TWAP (Time-Weighted Average Price) Orders module for Binance Futures Order Bot
 Handles TWAP order placement, execution, and management
 """
 
+import math
 import time
 import random
-from typing import Dict, Any, Optional, List
+import threading
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
-from src.config import config, SIDE_TYPES, ORDER_TYPES
+from src.config import config, SIDE_TYPES, ORDER_TYPES, MAX_BATCH_ORDERS
 from src.logger import logger
 from src.validator import validator, ValidationError
 from src.api_client import BinanceClient
 from src.market_orders import MarketOrder
 
+# Market chunks due within this many seconds of the previous one share a batchOrders request
+TWAP_BATCH_WINDOW = 0.2
+
+# Relative tolerance for chunk sizes (and volume weights) adding up to the total
+CHUNK_SUM_TOLERANCE = 1e-9
+
+def _chunk_intervals(num_chunks: int, base_interval: float, randomize: bool) -> List[float]:
+    """
+    Wait before each chunk, in seconds (the first chunk executes immediately)
+    
+    With randomize, each wait varies ±20% around base_interval and the waits are rescaled
+    to add up to the unrandomized schedule, so jitter never pushes the TWAP past its duration.
+    """
+    if not randomize or num_chunks < 2:
+        return [0.0] + [base_interval] * (num_chunks - 1)
+    
+    waits = [0.8 + random.random() * 0.4 for _ in range(num_chunks - 1)]
+    scale = base_interval * (num_chunks - 1) / sum(waits)
+    return [0.0] + [wait * scale for wait in waits]
+
+def _batch_schedule(intervals: List[float], max_batch_size: int) -> List[Tuple[float, int]]:
+    """
+    Merge chunks due within TWAP_BATCH_WINDOW of the previous one into a single batch
+    
+    Returns (wait before the batch, number of chunks in it) pairs covering every chunk in
+    order. Waits absorbed into a batch are carried into the next one, so later chunks keep
+    their place in the schedule.
+    """
+    schedule = []
+    carried = 0.0
+    for interval in intervals:
+        if schedule and interval < TWAP_BATCH_WINDOW and schedule[-1][1] < max_batch_size:
+            schedule[-1] = (schedule[-1][0], schedule[-1][1] + 1)
+            carried += interval
+        else:
+            schedule.append((interval + carried, 1))
+            carried = 0.0
+    return schedule
+
 class TWAPOrder:
     """TWAP (Time-Weighted Average Price) order implementation"""
     
+    # How long a limit chunk waits for a fill before it is cancelled (seconds)
+    LIMIT_FILL_TIMEOUT = 2
+    
     def __init__(self, client: BinanceClient):
         self.client = client
         self.market_order = MarketOrder(client)
+        self.price_stream = None  # Opened per execution by _start_price_stream
+        self._fill_stream = None
+        self._fill_listener = None
+        self._fills: Dict[int, Dict[str, Any]] = {}
+        self._fills_cond = threading.Condition()
+    
+    def _start_fill_stream(self, symbol: str):
+        """Acquire the account's shared user data stream recording FILLED updates for symbol, or None on failure"""
+        def listener(order: Dict[str, Any]):
+            if order.get("s") == symbol and order.get("X") == "FILLED":
+                self._record_fill(order)
+        
+        try:
+            from src.user_stream import UserDataStream
+            
+            stream = UserDataStream.acquire(self.client, listener)
+            self._fill_listener = listener
+            return stream
+        except Exception as e:
+            logger.log_error(e, f"User data stream unavailable for {symbol}, falling back to polling")
+            return None
+    
+    def _stop_fill_stream(self):
+        """Release the fill stream, if any, and forget unclaimed fills"""
+        if self._fill_stream is not None:
+            self._fill_stream.release(self._fill_listener)
+            self._fill_stream = None
+            self._fill_listener = None
+        with self._fills_cond:
+            self._fills.clear()
+    
+    def _record_fill(self, order: Dict[str, Any]):
+        """Store a streamed fill and wake chunks waiting on it"""
+        with self._fills_cond:
+            self._fills[order["i"]] = order
+            self._fills_cond.notify_all()
+    
+    def _wait_for_fill(self, order_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Wait up to LIMIT_FILL_TIMEOUT seconds for an order's fill
+        
+        Returns the streamed order update as soon as it arrives, or None on timeout
+        (or after a plain wait when no fill stream is running).
+        """
+        if self._fill_stream is None:
+            time.sleep(self.LIMIT_FILL_TIMEOUT)
+            return None
+        
+        with self._fills_cond:
+            self._fills_cond.wait_for(lambda: order_id in self._fills, self.LIMIT_FILL_TIMEOUT)
+            return self._fills.pop(order_id, None)
+    
+    def _start_price_stream(self, symbol: str):
+        """Start a book ticker stream for symbol, or None if it is unavailable"""
+        try:
+            from src.price_stream import PriceStream
+            
+            price_stream = PriceStream()
+            price_stream.subscribe(symbol)
+            return price_stream
+        except Exception as e:
+            logger.log_error(e, f"Price stream unavailable for {symbol}, using the REST ticker")
+            return None
+    
+    def _get_current_price(self, symbol: str) -> float:
+        """Latest streamed price for a symbol, falling back to the REST ticker when stale"""
+        price = self.price_stream.get_price(symbol) if self.price_stream is not None else None
+        if price is None:
+            ticker = self.client.get_symbol_price_ticker(symbol)
+            price = float(ticker['price'])
+        return price
+    
+    def _get_expected_fill_price(self, symbol: str, side: str) -> float:
+        """Price a market order should fill at: the streamed ask for BUY or bid for SELL"""
+        book = self.price_stream.get_book(symbol) if self.price_stream is not None else None
+        if book is None:
+            return self._get_current_price(symbol)
+        return book[1] if side.upper() == SIDE_TYPES["BUY"] else book[0]
     
     def execute_twap_strategy(self, 
                             symbol: str, 
@@ -29,7 +153,8 @@ class TWAPOrder:
                             use_limit_orders: bool = False,
                             limit_price_offset: float = 0.001,
                             randomize_intervals: bool = True,
-                            max_slippage: float = 0.01) -> Dict[str, Any]:
+                            max_slippage: float = 0.01,
+                            chunk_sizes: Optional[List[float]] = None) -> Dict[str, Any]:
         """
         Execute TWAP strategy by splitting large orders into smaller chunks over time
         
@@ -43,6 +168,7 @@ class TWAPOrder:
             limit_price_offset: Price offset for limit orders (percentage)
             randomize_intervals: Whether to randomize intervals between orders
             max_slippage: Maximum allowed slippage per order
+            chunk_sizes: Quantity of each chunk (num_chunks entries); defaults to an even split
             
         Returns:
             TWAP execution results
@@ -52,6 +178,7 @@ class TWAPOrder:
             validator.validate_symbol(symbol)
             validator.validate_side(side)
             total_quantity = validator.validate_quantity(total_quantity)
+            symbol, side = symbol.upper(), side.upper()
             
             if duration_seconds <= 0:
                 raise ValidationError("Duration must be positive")
@@ -60,8 +187,15 @@ class TWAPOrder:
             if num_chunks > total_quantity:
                 raise ValidationError("Number of chunks cannot exceed total quantity")
             
-            # Calculate chunk size and interval
-            chunk_size = total_quantity / num_chunks
+            # Calculate chunk sizes and interval
+            if chunk_sizes is None:
+                chunk_sizes = [total_quantity / num_chunks] * num_chunks
+            elif len(chunk_sizes) != num_chunks:
+                raise ValidationError("Number of chunk sizes must match number of chunks")
+            elif not all(size > 0 for size in chunk_sizes):
+                raise ValidationError("Chunk sizes must be positive")
+            elif abs(math.fsum(chunk_sizes) - total_quantity) > CHUNK_SUM_TOLERANCE * total_quantity:
+                raise ValidationError("Chunk sizes must add up to the total quantity")
             base_interval = duration_seconds / num_chunks
             
             # Log TWAP strategy start
@@ -88,52 +222,21 @@ class TWAPOrder:
             
             start_time = time.time()
             
-            for i in range(num_chunks):
-                try:
-                    # Calculate interval with optional randomization
-                    if randomize_intervals:
-                        interval = base_interval * (0.8 + random.random() * 0.4)  # ±20% variation
-                    else:
-                        interval = base_interval
-                    
-                    # Wait for next execution (except for first chunk)
-                    if i > 0:
-                        time.sleep(interval)
-                    
-                    # Get current market price
-                    ticker = self.client.get_symbol_price_ticker(symbol)
-                    current_price = float(ticker['price'])
-                    
-                    # Execute chunk
-                    if use_limit_orders:
-                        # Calculate limit price
-                        if side == SIDE_TYPES["BUY"]:
-                            limit_price = current_price * (1 + limit_price_offset)
-                        else:
-                            limit_price = current_price * (1 - limit_price_offset)
-                        
-                        chunk_result = self._execute_limit_chunk(
-                            symbol, side, chunk_size, limit_price, i + 1
-                        )
-                    else:
-                        chunk_result = self._execute_market_chunk(
-                            symbol, side, chunk_size, current_price, max_slippage, i + 1
-                        )
-                    
-                    execution_results["chunks"].append(chunk_result)
-                    execution_results["total_executed"] += chunk_result.get("executed_quantity", 0)
-                    execution_results["total_cost"] += chunk_result.get("cost", 0)
-                    
-                    # Log chunk execution
-                    logger.logger.info(f"TWAP chunk {i+1}/{num_chunks} executed: {chunk_result.get('executed_quantity')} @ {chunk_result.get('price')}")
-                    
-                except Exception as e:
-                    logger.log_error(e, f"TWAP chunk {i+1} failed")
-                    execution_results["chunks"].append({
-                        "chunk_number": i + 1,
-                        "status": "failed",
-                        "error": str(e)
-                    })
+            # Stream prices for the chunk loop instead of polling the ticker per chunk
+            self.price_stream = self._start_price_stream(symbol)
+            try:
+                if use_limit_orders:
+                    # Limit chunks are resolved from pushed fills rather than a fixed wait
+                    self._fill_stream = self._start_fill_stream(symbol)
+                
+                self._run_chunks(symbol, side, chunk_sizes, num_chunks, base_interval,
+                                 use_limit_orders, limit_price_offset, randomize_intervals,
+                                 max_slippage, execution_results)
+            finally:
+                if self.price_stream is not None:
+                    self.price_stream.stop()
+                    self.price_stream = None
+                self._stop_fill_stream()
             
             # Calculate average price
             if execution_results["total_executed"] > 0:
@@ -155,6 +258,139 @@ class TWAPOrder:
             logger.log_error(e, f"TWAP strategy failed for {symbol}")
             raise
     
+    def _run_chunks(self,
+                    symbol: str,
+                    side: str,
+                    chunk_sizes: List[float],
+                    num_chunks: int,
+                    base_interval: float,
+                    use_limit_orders: bool,
+                    limit_price_offset: float,
+                    randomize_intervals: bool,
+                    max_slippage: float,
+                    execution_results: Dict[str, Any]) -> None:
+        """Dispatch the chunks on schedule and add their results to execution_results"""
+        # Market chunks run on a single worker thread, so each chunk's order round-trips
+        # overlap the wait for the next one instead of adding to it. A limit chunk also
+        # waits up to LIMIT_FILL_TIMEOUT for its fill, so enough workers are started that
+        # those waits never hold up the next chunk (intervals can be 20% short when randomized),
+        # up to the size of the client's connection pool
+        if use_limit_orders:
+            max_workers = min(num_chunks, self.client.POOL_MAXSIZE,
+                              math.ceil(self.LIMIT_FILL_TIMEOUT / (0.8 * base_interval)) + 1)
+        else:
+            max_workers = 1
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            intervals = _chunk_intervals(num_chunks, base_interval, randomize_intervals)
+            # Limit chunks each wait on their own fill, so only market chunks are batched
+            max_batch_size = 1 if use_limit_orders else MAX_BATCH_ORDERS
+            
+            # Absolute monotonic deadlines, so time spent between waits never accumulates as drift
+            next_deadline = time.monotonic()
+            next_chunk = 1
+            for interval, batch_size in _batch_schedule(intervals, max_batch_size):
+                # Wait for next execution (except for first chunk)
+                next_deadline += interval
+                delay = next_deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                
+                chunk_numbers = list(range(next_chunk, next_chunk + batch_size))
+                quantities = chunk_sizes[next_chunk - 1:next_chunk - 1 + batch_size]
+                next_chunk += batch_size
+                futures.append(executor.submit(
+                    self._execute_chunks, symbol, side, quantities, chunk_numbers,
+                    use_limit_orders, limit_price_offset, max_slippage
+                ))
+            
+            for future in futures:
+                for chunk_result in future.result():
+                    execution_results["chunks"].append(chunk_result)
+                    
+                    if chunk_result.get("status") == "failed":
+                        continue
+                    
+                    execution_results["total_executed"] += chunk_result.get("executed_quantity", 0)
+                    execution_results["total_cost"] += chunk_result.get("cost", 0)
+                    
+                    # Log chunk execution
+                    logger.logger.info(f"TWAP chunk {chunk_result['chunk_number']}/{num_chunks} executed: {chunk_result.get('executed_quantity')} @ {chunk_result.get('price')}")
+    
+    def _execute_chunks(self,
+                        symbol: str,
+                        side: str,
+                        quantities: List[float],
+                        chunk_numbers: List[int],
+                        use_limit_orders: bool,
+                        limit_price_offset: float,
+                        max_slippage: float) -> List[Dict[str, Any]]:
+        """Price and execute co-scheduled TWAP chunks, returning failed results instead of raising"""
+        try:
+            # Market chunks measure slippage against the touch price read right before the POST
+            if not use_limit_orders:
+                expected_price = self._get_expected_fill_price(symbol, side)
+                if len(chunk_numbers) > 1:
+                    return self._execute_market_batch(
+                        symbol, side, quantities, expected_price, max_slippage, chunk_numbers
+                    )
+                return [self._execute_market_chunk(
+                    symbol, side, quantities[0], expected_price, max_slippage, chunk_numbers[0]
+                )]
+            
+            # Get current market price
+            current_price = self._get_current_price(symbol)
+            
+            # Calculate limit price
+            if side == SIDE_TYPES["BUY"]:
+                limit_price = current_price * (1 + limit_price_offset)
+            else:
+                limit_price = current_price * (1 - limit_price_offset)
+            
+            return [self._execute_limit_chunk(
+                symbol, side, quantities[0], limit_price, chunk_numbers[0]
+            )]
+            
+        except Exception as e:
+            logger.log_error(e, f"TWAP chunks {chunk_numbers} failed")
+            return [
+                {"chunk_number": chunk_number, "status": "failed", "error": str(e)}
+                for chunk_number in chunk_numbers
+            ]
+    
+    def _execute_market_batch(self,
+                              symbol: str,
+                              side: str,
+                              quantities: List[float],
+                              expected_price: float,
+                              max_slippage: float,
+                              chunk_numbers: List[int]) -> List[Dict[str, Any]]:
+        """Execute several co-scheduled market chunks with a single batchOrders request"""
+        responses = self.market_order.place_batch_market_orders(
+            [{"symbol": symbol, "side": side, "quantity": quantity} for quantity in quantities],
+            new_order_resp_type="RESULT"
+        )
+        
+        results = []
+        for chunk_number, order_response in zip(chunk_numbers, responses):
+            try:
+                if 'orderId' not in order_response:
+                    raise RuntimeError(order_response.get('msg', 'Batch order rejected'))
+                
+                results.append(self._market_chunk_result(
+                    symbol, order_response, expected_price, max_slippage, chunk_number
+                ))
+            except Exception as e:
+                logger.log_error(e, f"Market chunk {chunk_number} execution failed")
+                results.append({
+                    "chunk_number": chunk_number,
+                    "status": "failed",
+                    "error": str(e)
+                })
+        
+        return results
+    
     def _execute_market_chunk(self, 
                             symbol: str, 
                             side: str, 
@@ -164,37 +400,14 @@ class TWAPOrder:
                             chunk_number: int) -> Dict[str, Any]:
         """Execute a single market order chunk"""
         try:
-            # Place market order
-            order_response = self.market_order.place_market_order(symbol, side, quantity)
-            
-            # Get execution details
-            order_id = order_response.get('orderId')
-            if order_id:
-                order_status = self.client.get_order(symbol, order_id)
-                
-                if order_status.get('status') == 'FILLED':
-                    executed_quantity = float(order_status.get('executedQty', 0))
-                    avg_price = float(order_status.get('avgPrice', 0))
-                    
-                    # Check slippage
-                    slippage = abs(avg_price - expected_price) / expected_price
-                    
-                    return {
-                        "chunk_number": chunk_number,
-                        "status": "executed",
-                        "order_id": order_id,
-                        "executed_quantity": executed_quantity,
-                        "price": avg_price,
-                        "cost": executed_quantity * avg_price,
-                        "slippage": slippage,
-                        "within_slippage": slippage <= max_slippage
-                    }
+            # Place market order, asking for the execution result in the response
+            order_response = self.market_order.place_market_order(
+                symbol, side, quantity, new_order_resp_type="RESULT"
+            )
             
-            return {
-                "chunk_number": chunk_number,
-                "status": "pending",
-                "order_id": order_id
-            }
+            return self._market_chunk_result(
+                symbol, order_response, expected_price, max_slippage, chunk_number
+            )
             
         except Exception as e:
             logger.log_error(e, f"Market chunk {chunk_number} execution failed")
@@ -204,6 +417,45 @@ class TWAPOrder:
                 "error": str(e)
             }
     
+    def _market_chunk_result(self,
+                             symbol: str,
+                             order_response: Dict[str, Any],
+                             expected_price: float,
+                             max_slippage: float,
+                             chunk_number: int) -> Dict[str, Any]:
+        """Build a market chunk's result from its order response"""
+        # Get execution details (query the order only if the response isn't final yet)
+        order_id = order_response.get('orderId')
+        if order_id:
+            if order_response.get('status') == 'FILLED':
+                order_status = order_response
+            else:
+                order_status = self.client.get_order(symbol, order_id)
+            
+            if order_status.get('status') == 'FILLED':
+                executed_quantity = float(order_status.get('executedQty', 0))
+                avg_price = float(order_status.get('avgPrice', 0))
+                
+                # Check slippage
+                slippage = abs(avg_price - expected_price) / expected_price
+                
+                return {
+                    "chunk_number": chunk_number,
+                    "status": "executed",
+                    "order_id": order_id,
+                    "executed_quantity": executed_quantity,
+                    "price": avg_price,
+                    "cost": executed_quantity * avg_price,
+                    "slippage": slippage,
+                    "within_slippage": slippage <= max_slippage
+                }
+        
+        return {
+            "chunk_number": chunk_number,
+            "status": "pending",
+            "order_id": order_id
+        }
+    
     def _execute_limit_chunk(self, 
                            symbol: str, 
                            side: str, 
@@ -221,10 +473,16 @@ class TWAPOrder:
             # Monitor order for a short time
             order_id = order_response.get('orderId')
             if order_id:
-                # Wait a bit for potential fill
-                time.sleep(2)
-                
-                order_status = self.client.get_order(symbol, order_id)
+                # Wait a bit for potential fill, returning as soon as the stream reports it
+                fill = self._wait_for_fill(order_id)
+                if fill is not None:
+                    order_status = {
+                        'status': 'FILLED',
+                        'executedQty': fill['z'],
+                        'avgPrice': fill['ap']
+                    }
+                else:
+                    order_status = self.client.get_order(symbol, order_id)
                 
                 if order_status.get('status') == 'FILLED':
                     executed_quantity = float(order_status.get('executedQty', 0))
@@ -269,6 +527,44 @@ class TWAPManager:
         self.client = client
         self.twap_order = TWAPOrder(client)
     
+    def execute_multi_symbol_twap(self, plans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute several TWAP strategies concurrently on the client's shared worker pool
+        
+        Args:
+            plans: Keyword arguments for execute_twap_strategy, one dict per TWAP
+            
+        Returns:
+            One result per plan, in plan order. Plans that raised have
+            'status' set to 'failed' and an 'error' message
+        """
+        # Each TWAP gets its own TWAPOrder, since fills are tracked per strategy; they all
+        # share the account's user data stream, which closes once the last one releases it
+        futures = {
+            self.client.executor.submit(TWAPOrder(self.client).execute_twap_strategy, **plan): index
+            for index, plan in enumerate(plans)
+        }
+        
+        results = [None] * len(plans)
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                results[index] = {
+                    "symbol": plans[index].get("symbol"),
+                    "status": "failed",
+                    "error": str(e)
+                }
+            
+            logger.log_strategy_event("TWAP", "plan_finished", {
+                "plan": index + 1,
+                "symbol": plans[index].get("symbol"),
+                "failed": results[index].get("status") == "failed"
+            })
+        
+        return results
+    
     def execute_volume_weighted_twap(self, 
                                    symbol: str, 
                                    side: str, 
@@ -290,15 +586,22 @@ class TWAPManager:
             if not volume_profile or len(volume_profile) == 0:
                 raise ValidationError("Volume profile cannot be empty")
             
-            if abs(sum(volume_profile) - 1.0) > 0.01:
+            # Checked up front so no chunk is placed for a profile that would fail later
+            if not all(weight > 0 for weight in volume_profile):
+                raise ValidationError("Volume profile weights must be positive")
+            
+            weight_sum = math.fsum(volume_profile)
+            if abs(weight_sum - 1.0) > CHUNK_SUM_TOLERANCE:
                 raise ValidationError("Volume profile weights must sum to 1.0")
             
+            # Normalized by the exact sum so the chunks add up to total_quantity
             num_chunks = len(volume_profile)
-            chunk_sizes = [total_quantity * weight for weight in volume_profile]
+            chunk_sizes = [total_quantity * weight / weight_sum for weight in volume_profile]
             
             # Execute TWAP with custom chunk sizes
             return self.twap_order.execute_twap_strategy(
-                symbol, side, total_quantity, duration_seconds, num_chunks
+                symbol, side, total_quantity, duration_seconds, num_chunks,
+                chunk_sizes=chunk_sizes
             )
             
         except Exception as e:
@@ -328,10 +631,10 @@ class TWAPManager:
             if len(klines) < 2:
                 raise ValidationError("Insufficient price data for volatility calculation")
             
-            # Calculate price volatility
-            prices = [float(kline[4]) for kline in klines]  # Close prices
-            returns = [(prices[i] - prices[i-1]) / prices[i-1] for i in range(1, len(prices))]
-            volatility = (sum(r*r for r in returns) / len(returns)) ** 0.5
+            # Calculate price volatility (RMS of close-to-close returns, in one pass)
+            prices = list(map(float, map(itemgetter(4), klines)))  # Close prices
+            squared_returns = sum(((curr - prev) / prev) ** 2 for prev, curr in zip(prices, prices[1:]))
+            volatility = (squared_returns / (len(prices) - 1)) ** 0.5
             
             # Adjust strategy based on volatility
             if volatility > volatility_threshold:
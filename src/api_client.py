@@ -4,36 +4,223 @@ Handles all Binance Futures API interactions with authentication and error handl
 """
 
 import time
+import json
+import threading
 import hmac
 import hashlib
 import requests
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, Optional, Callable
 from urllib.parse import urlencode
 from src.config import config
 from src.logger import logger
 
+try:
+    import orjson  # Optional C-accelerated encoder
+except ImportError:
+    orjson = None
+
+# Response body decoder (both accept raw bytes)
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Signed POST bodies are sent as a pre-encoded string, so their content type is set explicitly
+FORM_HEADERS = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+# Request weight of endpoints heavier than the default of 1, for client-side rate limiting
+ENDPOINT_WEIGHTS = {
+    '/fapi/v2/account': 5,
+    '/fapi/v2/balance': 5,
+    '/fapi/v1/klines': 2,
+    '/fapi/v1/batchOrders': 5,
+    '/fapi/v1/allOrders': 5,
+    '/fapi/v1/userTrades': 5
+}
+
+# Cheapest endpoint, used to keep pooled connections warm
+PING_ENDPOINT = '/fapi/v1/ping'
+
 class BinanceClient:
     """Binance Futures API client"""
     
+    # How long kline responses are reused (seconds). Kept short because the last kline is
+    # still open and callers read its close as the current price
+    KLINES_CACHE_TTL = 2
+    
+    # How long a price ticker response is shared between callers (seconds)
+    TICKER_CACHE_TTL = 0.5
+    
+    # Exchange info is near-static; refresh it every 10 minutes
+    EXCHANGE_INFO_CACHE_TTL = 600
+    
+    # Connection pool sizing for the shared HTTPS session
+    POOL_CONNECTIONS = 10
+    POOL_MAXSIZE = 50
+    
+    # Seconds between pings that keep pooled connections warm
+    PING_INTERVAL = 30
+    
+    # Pings stop once no other request has been made for this many seconds
+    PING_IDLE_TIMEOUT = 300
+    
+    # Seconds between re-syncs of the local clock offset against server time
+    TIME_SYNC_INTERVAL = 600
+    
+    # Request weight spent per minute before requests are held back (Binance bans above 1200)
+    WEIGHT_LIMIT_PER_MINUTE = 1150
+    
     def __init__(self):
         self.base_url = config.binance.base_url
         self.api_key = config.binance.api_key
         self.api_secret = config.binance.api_secret
+        self._hmac = hmac.new(self.api_secret.encode('utf-8'), digestmod=hashlib.sha256)
         self.session = requests.Session()
+        # One keep-alive pool shared by every order module, sized for concurrent placement.
+        # urllib3 only retries idempotent methods, so order placement (POST) is never resent.
+        # 429/418 are never retried here (not even when they carry Retry-After): _update_weight
+        # must see them to record the ban.
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS, pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504],
+                              respect_retry_after_header=False)
+        ))
         self.session.headers.update({
             'X-MBX-APIKEY': self.api_key,
             'Content-Type': 'application/json'
         })
+        self._cache: Dict[tuple, tuple] = {}
+        self._cache_lock = threading.Lock()
+        self._time_offset_ms = 0
+        self._time_synced_at: Optional[float] = None
+        self._weight_lock = threading.Lock()
+        self._weight_used = 0
+        self._weight_window_start = time.monotonic()
+        self._blocked_until = 0.0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        
+        self._closed = threading.Event()
+        self._last_request = time.monotonic()
+        self._pinger: Optional[threading.Thread] = None
+        self._pinger_lock = threading.Lock()
+    
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Shared worker pool for fanning out orders and strategies, created on first use"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    # Bounded by the connection pool size
+                    self._executor = ThreadPoolExecutor(max_workers=self.POOL_MAXSIZE)
+        return self._executor
+    
+    def _touch(self):
+        """Record API activity, starting the keep-warm pings if they aren't running"""
+        self._last_request = time.monotonic()
+        if self._pinger is None and not self._closed.is_set():
+            with self._pinger_lock:
+                if self._pinger is None:
+                    self._pinger = threading.Thread(target=self._keep_warm, daemon=True)
+                    self._pinger.start()
+    
+    def _keep_warm(self):
+        """
+        Ping the API every PING_INTERVAL seconds so pooled connections stay open
+        
+        Stops after PING_IDLE_TIMEOUT seconds without other requests, on close(), or when a
+        ping fails (already logged by _make_request); the next request starts it again.
+        """
+        try:
+            while not self._closed.wait(self.PING_INTERVAL):
+                if time.monotonic() - self._last_request > self.PING_IDLE_TIMEOUT:
+                    break
+                try:
+                    self._make_request('GET', PING_ENDPOINT)
+                except Exception:
+                    break
+        finally:
+            with self._pinger_lock:
+                self._pinger = None
+    
+    def close(self):
+        """Stop the keep-warm pings, the worker pool and close pooled connections"""
+        self._closed.set()
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        self.session.close()
+    
+    def _cached(self, key: tuple, ttl: float, fetch: Callable[[], Any]) -> Any:
+        """Return a cached response younger than ttl seconds, or fetch and cache a new one"""
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+        if entry is not None and now - entry[0] < ttl:
+            return entry[1]
+        
+        # Fetched outside the lock so a slow request never blocks other keys; concurrent
+        # misses on the same key may both fetch, and the last one wins
+        value = fetch()
+        with self._cache_lock:
+            self._cache[key] = (now, value)
+        return value
     
-    def _generate_signature(self, params: Dict[str, Any]) -> str:
-        """Generate HMAC SHA256 signature for authenticated requests"""
-        query_string = urlencode(params)
-        signature = hmac.new(
-            self.api_secret.encode('utf-8'),
-            query_string.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
+    def _acquire_weight(self, weight: int):
+        """Block until weight fits into this minute's budget and any Retry-After ban has passed"""
+        while True:
+            with self._weight_lock:
+                now = time.monotonic()
+                if now - self._weight_window_start >= 60:
+                    self._weight_window_start = now
+                    self._weight_used = 0
+                
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._weight_used + weight <= self.WEIGHT_LIMIT_PER_MINUTE:
+                        self._weight_used += weight
+                        return
+                    wait = self._weight_window_start + 60 - now
+            
+            logger.logger.warning("Request weight limit reached, waiting %.1fs", wait)
+            time.sleep(wait)
+    
+    def _update_weight(self, response: requests.Response):
+        """Adopt the server's used-weight count and honour Retry-After on 429/418 responses"""
+        used_weight = response.headers.get('X-MBX-USED-WEIGHT-1M')
+        with self._weight_lock:
+            if used_weight is not None:
+                self._weight_used = int(used_weight)
+            if response.status_code in (418, 429):
+                retry_after = float(response.headers.get('Retry-After', 60))
+                self._blocked_until = time.monotonic() + retry_after
+    
+    def _timestamp(self) -> int:
+        """Current server time in milliseconds: the local clock corrected by the synced offset"""
+        if self._time_synced_at is None or time.monotonic() - self._time_synced_at > self.TIME_SYNC_INTERVAL:
+            self._sync_server_time()
+        return int(time.time() * 1000) + self._time_offset_ms
+    
+    def _sync_server_time(self):
+        """Measure the local clock's offset from server time (keeps the old offset on failure)"""
+        try:
+            sent = time.time()
+            server_time = self.get_server_time()
+            received = time.time()
+            # Assume the server read its clock halfway through the round trip
+            self._time_offset_ms = server_time - int((sent + received) * 500)
+        except Exception as e:
+            logger.log_error(e, "Server time sync failed, keeping previous clock offset")
+        self._time_synced_at = time.monotonic()
+    
+    def _generate_signature(self, query_string: str) -> str:
+        """Generate HMAC SHA256 signature of an already urlencoded query string"""
+        # Copying the pre-keyed HMAC skips re-deriving the inner/outer key pads
+        signature = self._hmac.copy()
+        # urlencode output is percent-escaped, so it is always plain ASCII
+        signature.update(query_string.encode('ascii'))
+        return signature.hexdigest()
     
     def _make_request(self, method: str, endpoint: str, params: Dict[str, Any] = None, 
                      signed: bool = False) -> Dict[str, Any]:
@@ -43,31 +230,49 @@ class BinanceClient:
         if params is None:
             params = {}
         
-        # Add timestamp for signed requests
+        # Add timestamp and signature for signed requests. The query string is encoded
+        # once and sent exactly as signed, so requests never re-encodes the params.
+        payload = params
+        headers = None
         if signed:
-            params['timestamp'] = int(time.time() * 1000)
-            params['signature'] = self._generate_signature(params)
+            params['timestamp'] = self._timestamp()
+            query_string = urlencode(params)
+            payload = f"{query_string}&signature={self._generate_signature(query_string)}"
+            headers = FORM_HEADERS
         
         # Log API call
         logger.log_api_call(endpoint, method, params)
         
+        # Pings don't count as activity, so an idle client stops pinging
+        if endpoint != PING_ENDPOINT:
+            self._touch()
+        
+        self._acquire_weight(ENDPOINT_WEIGHTS.get(endpoint, 1))
+        
         try:
             if method.upper() == 'GET':
-                response = self.session.get(url, params=params)
+                response = self.session.get(url, params=payload)
             elif method.upper() == 'POST':
-                response = self.session.post(url, data=params)
+                response = self.session.post(url, data=payload, headers=headers)
+            elif method.upper() == 'PUT':
+                response = self.session.put(url, params=payload)
             elif method.upper() == 'DELETE':
-                response = self.session.delete(url, params=params)
+                response = self.session.delete(url, params=payload)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
             
+            self._update_weight(response)
             response.raise_for_status()
-            return response.json()
+            return _json_loads(response.content)
             
         except requests.exceptions.RequestException as e:
             logger.log_error(e, f"API request failed: {method} {endpoint}")
             raise
     
+    def get_server_time(self) -> int:
+        """Get the server time in milliseconds"""
+        return self._make_request('GET', '/fapi/v1/time')['serverTime']
+    
     def get_account_info(self) -> Dict[str, Any]:
         """Get account information"""
         return self._make_request('GET', '/fapi/v2/account', signed=True)
@@ -84,23 +289,38 @@ class BinanceClient:
         return self._make_request('GET', '/fapi/v2/positionRisk', params, signed=True)
     
     def get_symbol_price_ticker(self, symbol: str) -> Dict[str, Any]:
-        """Get current price for a symbol"""
+        """Get current price for a symbol (cached for TICKER_CACHE_TTL seconds)"""
         params = {'symbol': symbol}
-        return self._make_request('GET', '/fapi/v1/ticker/price', params)
+        return self._cached(
+            ('ticker', symbol), self.TICKER_CACHE_TTL,
+            lambda: self._make_request('GET', '/fapi/v1/ticker/price', params)
+        )
     
     def get_klines(self, symbol: str, interval: str, limit: int = 100) -> list:
-        """Get kline/candlestick data"""
+        """Get kline/candlestick data (cached briefly per symbol/interval/limit)"""
         params = {
             'symbol': symbol,
             'interval': interval,
             'limit': limit
         }
-        return self._make_request('GET', '/fapi/v1/klines', params)
+        return self._cached(
+            ('klines', symbol, interval, limit), self.KLINES_CACHE_TTL,
+            lambda: self._make_request('GET', '/fapi/v1/klines', params)
+        )
     
     def place_order(self, order_params: Dict[str, Any]) -> Dict[str, Any]:
         """Place a new order"""
         return self._make_request('POST', '/fapi/v1/order', order_params, signed=True)
     
+    def place_batch_orders(self, orders: list) -> list:
+        """Place up to MAX_BATCH_ORDERS orders in a single request"""
+        if orjson is not None:
+            batch_orders = orjson.dumps(orders).decode('utf-8')
+        else:
+            batch_orders = json.dumps(orders)
+        params = {'batchOrders': batch_orders}
+        return self._make_request('POST', '/fapi/v1/batchOrders', params, signed=True)
+    
     def place_oco_order(self, oco_params: Dict[str, Any]) -> Dict[str, Any]:
         """Place an OCO order"""
         return self._make_request('POST', '/fapi/v1/order/oco', oco_params, signed=True)
@@ -133,12 +353,15 @@ class BinanceClient:
             params['symbol'] = symbol
         return self._make_request('GET', '/fapi/v1/openOrders', params, signed=True)
     
-    def get_order_history(self, symbol: str, limit: int = 500) -> list:
-        """Get order history"""
+    def get_order_history(self, symbol: str, limit: int = 500,
+                          start_time: Optional[int] = None) -> list:
+        """Get order history, optionally only orders since start_time (ms)"""
         params = {
             'symbol': symbol,
             'limit': limit
         }
+        if start_time is not None:
+            params['startTime'] = start_time
         return self._make_request('GET', '/fapi/v1/allOrders', params, signed=True)
     
     def get_trade_history(self, symbol: str, limit: int = 500) -> list:
@@ -165,18 +388,56 @@ class BinanceClient:
         }
         return self._make_request('POST', '/fapi/v1/marginType', params, signed=True)
     
+    def start_user_stream(self) -> str:
+        """Create a user data stream and return its listen key"""
+        return self._make_request('POST', '/fapi/v1/listenKey')['listenKey']
+    
+    def keepalive_user_stream(self) -> Dict[str, Any]:
+        """Extend the user data stream validity by 60 minutes"""
+        return self._make_request('PUT', '/fapi/v1/listenKey')
+    
+    def close_user_stream(self) -> Dict[str, Any]:
+        """Close the user data stream"""
+        return self._make_request('DELETE', '/fapi/v1/listenKey')
+    
+    def _get_exchange_info_index(self) -> tuple:
+        """Cached (exchange info, {symbol: symbol info}) pair, refreshed every EXCHANGE_INFO_CACHE_TTL seconds"""
+        def fetch():
+            exchange_info = self._make_request('GET', '/fapi/v1/exchangeInfo')
+            return exchange_info, {s['symbol']: s for s in exchange_info.get('symbols', [])}
+        
+        return self._cached(('exchange_info',), self.EXCHANGE_INFO_CACHE_TTL, fetch)
+    
     def get_exchange_info(self) -> Dict[str, Any]:
         """Get exchange information"""
-        return self._make_request('GET', '/fapi/v1/exchangeInfo')
+        return self._get_exchange_info_index()[0]
     
     def get_symbol_info(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get symbol information"""
         try:
-            exchange_info = self.get_exchange_info()
-            for symbol_info in exchange_info.get('symbols', []):
-                if symbol_info['symbol'] == symbol:
-                    return symbol_info
-            return None
+            return self._get_exchange_info_index()[1].get(symbol)
         except Exception as e:
             logger.log_error(e, f"Failed to get symbol info for {symbol}")
-            return None 
\ No newline at end of file
+            return None
+    
+    def get_symbol_filters(self, symbol: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get a symbol's trading filters (PRICE_FILTER, LOT_SIZE, ...) keyed by filterType
+        
+        Filters do not change within a session, so they are fetched once per symbol.
+        Returns an empty dict (not cached) if the symbol info is unavailable.
+        """
+        key = ('symbol_filters', symbol)
+        with self._cache_lock:
+            entry = self._cache.get(key)
+        if entry is not None:
+            return entry[1]
+        
+        symbol_info = self.get_symbol_info(symbol)
+        if symbol_info is None:
+            return {}
+        
+        filters = {f['filterType']: f for f in symbol_info.get('filters', [])}
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), filters)
+        return filters 
\ No newline at end of file
@@ -5,7 +5,7 @@ Handles API keys, settings, and constants
 
 import os
 from typing import Dict, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 @dataclass
 class BinanceConfig:
@@ -13,7 +13,17 @@ class BinanceConfig:
     api_key: str
     api_secret: str
     testnet: bool = True
-    base_url: str = "https://testnet.binancefuture.com" if testnet else "https://fapi.binance.com"
+    base_url: str = field(default="", init=False)
+    stream_url: str = field(default="", init=False)
+    
+    def __post_init__(self):
+        """Select REST and WebSocket endpoints for the configured network"""
+        if self.testnet:
+            self.base_url = "https://testnet.binancefuture.com"
+            self.stream_url = "wss://stream.binancefuture.com"
+        else:
+            self.base_url = "https://fapi.binance.com"
+            self.stream_url = "wss://fstream.binance.com"
 
 @dataclass
 class TradingConfig:
@@ -29,6 +39,7 @@ class LoggingConfig:
     log_level: str = "INFO"
     log_file: str = "bot.log"
     log_format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    console_enabled: bool = True  # Only takes effect when stderr is a terminal
 
 # Common constants
 SUPPORTED_SYMBOLS = [
@@ -36,6 +47,9 @@ SUPPORTED_SYMBOLS = [
     "DOTUSDT", "LINKUSDT", "MATICUSDT", "AVAXUSDT", "UNIUSDT"
 ]
 
+# Hash set for membership checks (the list keeps display order for messages)
+SUPPORTED_SYMBOLS_SET = frozenset(SUPPORTED_SYMBOLS)
+
 ORDER_TYPES = {
     "MARKET": "MARKET",
     "LIMIT": "LIMIT",
@@ -57,6 +71,15 @@ TIME_IN_FORCE = {
     "FOK": "FOK"   # Fill or Kill
 }
 
+# Binance expects lowercase boolean strings in form-encoded parameters
+BOOL_PARAMS = {True: "true", False: "false"}
+
+# Maximum number of orders accepted by a single /fapi/v1/batchOrders request
+MAX_BATCH_ORDERS = 5
+
+# Maximum number of order requests sent concurrently (stays well inside the 10 orders/sec limit)
+MAX_CONCURRENT_REQUESTS = 5
+
 class Config:
     """Main configuration class"""
     
@@ -4,12 +4,27 @@ Handles limit order placement, execution, and management
 """
 
 import time
+import queue
+import random
+from decimal import Decimal
 from typing import Dict, Any, Optional
-from src.config import config, ORDER_TYPES, SIDE_TYPES, TIME_IN_FORCE
+from src.config import config, ORDER_TYPES, SIDE_TYPES, TIME_IN_FORCE, MAX_BATCH_ORDERS, BOOL_PARAMS
 from src.logger import logger
 from src.validator import validator, ValidationError
 from src.api_client import BinanceClient
 
+_LIMIT = ORDER_TYPES["LIMIT"]
+_STOP = ORDER_TYPES["STOP"]
+_GTC = TIME_IN_FORCE["GTC"]
+_BUY = SIDE_TYPES["BUY"]
+_SELL = SIDE_TYPES["SELL"]
+
+# Side that closes a position opened on the given side
+_OPPOSITE_SIDE = {_BUY: _SELL, _SELL: _BUY}
+
+# Order statuses after which an order can no longer fill
+FINAL_ORDER_STATUSES = ("FILLED", "CANCELED", "EXPIRED", "REJECTED")
+
 class LimitOrder:
     """Limit order implementation"""
     
@@ -46,21 +61,22 @@ class LimitOrder:
             quantity = validator.validate_quantity(quantity)
             price = validator.validate_price(price)
             validator.validate_time_in_force(time_in_force)
+            symbol, side = symbol.upper(), side.upper()
             
             # Prepare order parameters
             order_params = {
-                "symbol": symbol.upper(),
-                "side": side.upper(),
-                "type": ORDER_TYPES["LIMIT"],
+                "symbol": symbol,
+                "side": side,
+                "type": _LIMIT,
                 "quantity": quantity,
                 "price": price,
                 "timeInForce": time_in_force.upper(),
-                "reduceOnly": reduce_only,
-                "closeOnTrigger": close_on_trigger
+                "reduceOnly": BOOL_PARAMS[bool(reduce_only)],
+                "closeOnTrigger": BOOL_PARAMS[bool(close_on_trigger)]
             }
             
             # Log the order attempt
-            logger.logger.info(f"Placing limit order: {symbol} {side} {quantity} @ {price}")
+            logger.log_order_placed(order_params, None, "attempted")
             
             # Place the order
             response = self.client.place_order(order_params)
@@ -83,7 +99,7 @@ class LimitOrder:
                              price: float,
                              **kwargs) -> Dict[str, Any]:
         """Place a limit buy order"""
-        return self.place_limit_order(symbol, SIDE_TYPES["BUY"], quantity, price, **kwargs)
+        return self.place_limit_order(symbol, _BUY, quantity, price, **kwargs)
     
     def place_limit_sell_order(self, 
                               symbol: str, 
@@ -91,7 +107,67 @@ class LimitOrder:
                               price: float,
                               **kwargs) -> Dict[str, Any]:
         """Place a limit sell order"""
-        return self.place_limit_order(symbol, SIDE_TYPES["SELL"], quantity, price, **kwargs)
+        return self.place_limit_order(symbol, _SELL, quantity, price, **kwargs)
+    
+    def place_batch_limit_orders(self, orders: list) -> list:
+        """
+        Place several limit orders using the batch endpoint
+        
+        Args:
+            orders: List of dicts with 'symbol', 'side', 'quantity', 'price'
+                    and optional 'time_in_force' (default 'GTC')
+            
+        Returns:
+            One response per order, in input order. Orders that were rejected
+            (or whose batch request failed) have 'code' and 'msg' instead of 'orderId'.
+            'code' is None when the request itself failed, in which case the exchange
+            may still have accepted the orders
+        """
+        templates = {}
+        batch = []
+        for order in orders:
+            symbol = order.get('symbol')
+            side = order.get('side')
+            time_in_force = order.get('time_in_force', _GTC)
+            
+            # Validate and build the shared fields once per symbol/side/TIF (ladders reuse one)
+            key = (symbol, side, time_in_force)
+            template = templates.get(key)
+            if template is None:
+                validator.validate_symbol(symbol)
+                validator.validate_side(side)
+                validator.validate_time_in_force(time_in_force)
+                template = templates[key] = {
+                    "symbol": symbol.upper(),
+                    "side": side.upper(),
+                    "type": _LIMIT,
+                    "timeInForce": time_in_force.upper()
+                }
+            
+            order_params = template.copy()
+            order_params["quantity"] = str(validator.validate_quantity(order.get('quantity')))
+            order_params["price"] = str(validator.validate_price(order.get('price')))
+            batch.append(order_params)
+        
+        responses = []
+        for start in range(0, len(batch), MAX_BATCH_ORDERS):
+            chunk = batch[start:start + MAX_BATCH_ORDERS]
+            
+            logger.logger.info("Placing batch of %d limit orders", len(chunk))
+            
+            try:
+                chunk_responses = self.client.place_batch_orders(chunk)
+            except Exception as e:
+                logger.log_error(e, f"Batch limit order placement failed for {len(chunk)} orders")
+                chunk_responses = [{"code": None, "msg": str(e)} for _ in chunk]
+            
+            for order_params, response in zip(chunk, chunk_responses):
+                if 'orderId' in response:
+                    logger.log_order_placed(order_params, response['orderId'])
+            
+            responses.extend(chunk_responses)
+        
+        return responses
     
     def place_limit_order_by_quote_quantity(self,
                                           symbol: str,
@@ -116,8 +192,16 @@ class LimitOrder:
             quote_quantity = validator.validate_quantity(quote_quantity)
             price = validator.validate_price(price)
             
-            # Calculate quantity based on quote amount and price
-            quantity = quote_quantity / price
+            # Calculate quantity based on quote amount and price, rounded down to the
+            # symbol's lot step so the exchange doesn't reject it for precision
+            quantity = Decimal(str(quote_quantity)) / Decimal(str(price))
+            step_size = self.client.get_symbol_filters(symbol.upper()).get("LOT_SIZE", {}).get("stepSize")
+            if step_size:
+                step = Decimal(step_size)
+                quantity = (quantity // step) * step
+                if quantity <= 0:
+                    raise ValidationError(f"Quote quantity {quote_quantity} is below the lot step ({step_size})")
+            quantity = float(quantity)
             
             # Place the order
             return self.place_limit_order(symbol, side, quantity, price, **kwargs)
@@ -132,7 +216,7 @@ class LimitOrder:
                                 price: float,
                                 **kwargs) -> Dict[str, Any]:
         """Place a limit buy order using USDT amount"""
-        return self.place_limit_order_by_quote_quantity(symbol, SIDE_TYPES["BUY"], usdt_amount, price, **kwargs)
+        return self.place_limit_order_by_quote_quantity(symbol, _BUY, usdt_amount, price, **kwargs)
     
     def place_limit_sell_by_quote(self, 
                                  symbol: str, 
@@ -140,7 +224,7 @@ class LimitOrder:
                                  price: float,
                                  **kwargs) -> Dict[str, Any]:
         """Place a limit sell order using USDT amount"""
-        return self.place_limit_order_by_quote_quantity(symbol, SIDE_TYPES["SELL"], usdt_amount, price, **kwargs)
+        return self.place_limit_order_by_quote_quantity(symbol, _SELL, usdt_amount, price, **kwargs)
     
     def place_stop_limit_order(self, 
                               symbol: str, 
@@ -172,22 +256,23 @@ class LimitOrder:
             price = validator.validate_price(price)
             stop_price = validator.validate_stop_price(stop_price)
             validator.validate_time_in_force(time_in_force)
+            symbol, side = symbol.upper(), side.upper()
             
             # Prepare order parameters
             order_params = {
-                "symbol": symbol.upper(),
-                "side": side.upper(),
-                "type": ORDER_TYPES["STOP"],
+                "symbol": symbol,
+                "side": side,
+                "type": _STOP,
                 "quantity": quantity,
                 "price": price,
                 "stopPrice": stop_price,
                 "timeInForce": time_in_force.upper(),
-                "reduceOnly": reduce_only,
-                "closeOnTrigger": close_on_trigger
+                "reduceOnly": BOOL_PARAMS[bool(reduce_only)],
+                "closeOnTrigger": BOOL_PARAMS[bool(close_on_trigger)]
             }
             
             # Log the order attempt
-            logger.logger.info(f"Placing stop-limit order: {symbol} {side} {quantity} @ {price} (stop: {stop_price})")
+            logger.log_order_placed(order_params, None, "attempted")
             
             # Place the order
             response = self.client.place_order(order_params)
@@ -227,9 +312,24 @@ class LimitOrder:
 class LimitOrderManager:
     """Manager for limit order operations"""
     
+    # Fill polling backoff (seconds), used when the user data stream is unavailable
+    POLL_INITIAL_DELAY = 0.25
+    POLL_MAX_DELAY = 5.0
+    POLL_BACKOFF = 1.5
+    POLL_JITTER = 0.1
+    
+    # REST check interval while the user data stream is connected and delivers the fill
+    RECONCILE_INTERVAL = 30
+    
     def __init__(self, client: BinanceClient):
         self.client = client
         self.limit_order = LimitOrder(client)
+        
+        # Bound once so ladder and bracket loops skip the nested attribute lookups
+        self._place_limit = self.limit_order.place_limit_order
+        self._place_batch = self.limit_order.place_batch_limit_orders
+        self._place_tp = self.limit_order.place_take_profit_order
+        self._place_sl = self.limit_order.place_stop_loss_order
     
     def place_bracket_orders(self, 
                            symbol: str, 
@@ -253,28 +353,42 @@ class LimitOrderManager:
             orders = {}
             
             # Place entry order
-            entry_order = self.limit_order.place_limit_order(
+            entry_order = self._place_limit(
                 symbol, side, quantity, entry_price
             )
             orders['entry'] = entry_order
             
             # Determine opposite side for TP/SL
-            opposite_side = SIDE_TYPES["SELL"] if side == SIDE_TYPES["BUY"] else SIDE_TYPES["BUY"]
+            opposite_side = _OPPOSITE_SIDE[side.upper()]
             
-            # Place take profit order
-            tp_order = self.limit_order.place_take_profit_order(
+            # Place take profit and stop loss together; they don't depend on each other
+            tp_future = self.client.executor.submit(
+                self._place_tp,
                 symbol, opposite_side, quantity, take_profit_price
             )
-            orders['take_profit'] = tp_order
-            
-            # Place stop loss order
-            sl_order = self.limit_order.place_stop_loss_order(
+            sl_future = self.client.executor.submit(
+                self._place_sl,
                 symbol, opposite_side, quantity, stop_loss_price
             )
-            orders['stop_loss'] = sl_order
             
-            logger.logger.info(f"Bracket orders placed for {symbol}: Entry={entry_order.get('orderId')}, "
-                             f"TP={tp_order.get('orderId')}, SL={sl_order.get('orderId')}")
+            # Collect both legs before raising, so a leg that was placed is never left orphaned
+            errors = {}
+            for leg, future in (('take_profit', tp_future), ('stop_loss', sl_future)):
+                try:
+                    orders[leg] = future.result()
+                except Exception as e:
+                    errors[leg] = e
+            
+            if errors:
+                for leg in ('take_profit', 'stop_loss'):
+                    if leg in orders:
+                        self._cancel_bracket_leg(symbol, leg, orders[leg])
+                raise next(iter(errors.values()))
+            
+            tp_order, sl_order = orders['take_profit'], orders['stop_loss']
+            
+            logger.logger.info("Bracket orders placed for %s: Entry=%s, TP=%s, SL=%s", symbol,
+                               entry_order.get('orderId'), tp_order.get('orderId'), sl_order.get('orderId'))
             
             return orders
             
@@ -282,6 +396,15 @@ class LimitOrderManager:
             logger.log_error(e, f"Bracket orders placement failed for {symbol}")
             raise
     
+    def _cancel_bracket_leg(self, symbol: str, leg: str, order: Dict[str, Any]):
+        """Cancel a bracket leg whose counterpart failed, logging (not raising) cancel failures"""
+        order_id = order.get('orderId')
+        try:
+            self.client.cancel_order(symbol.upper(), order_id)
+            logger.log_order_cancelled(order_id, f"Other bracket leg failed, cancelled {leg}")
+        except Exception as e:
+            logger.log_error(e, f"Failed to cancel bracket {leg} order {order_id}")
+    
     def place_scaled_orders(self, 
                           symbol: str, 
                           side: str, 
@@ -302,16 +425,33 @@ class LimitOrderManager:
             if len(price_levels) != len(quantities):
                 raise ValueError("Price levels and quantities must have the same length")
             
-            if sum(quantities) != total_quantity:
+            # Compare in Decimal so float drift (e.g. 3 x 0.1 vs 0.3) doesn't reject valid ladders
+            if sum(Decimal(str(quantity)) for quantity in quantities) != Decimal(str(total_quantity)):
                 raise ValueError("Sum of quantities must equal total quantity")
             
-            orders = []
-            
-            for price, quantity in zip(price_levels, quantities):
-                order = self.limit_order.place_limit_order(symbol, side, quantity, price)
-                orders.append(order)
+            # Place the ladder through the batch endpoint (up to MAX_BATCH_ORDERS per request)
+            orders = self._place_batch([
+                {"symbol": symbol, "side": side, "quantity": quantity, "price": price}
+                for price, quantity in zip(price_levels, quantities)
+            ])
+            
+            # A failed batch request (e.g. a timeout) may still have been accepted, so its
+            # levels are never resent: that could leave duplicate orders on the book
+            unknown_prices = [price for price, order in zip(price_levels, orders)
+                              if 'orderId' not in order and order.get('code') is None]
+            if unknown_prices:
+                placed_ids = [order['orderId'] for order in orders if 'orderId' in order]
+                raise RuntimeError(
+                    f"Batch request failed for scaled levels at {unknown_prices}; they may have been "
+                    f"placed, check open orders (confirmed order IDs: {placed_ids})"
+                )
+            
+            for i, (price, quantity) in enumerate(zip(price_levels, quantities)):
+                # Retry levels the exchange rejected individually so failures still raise
+                if 'orderId' not in orders[i]:
+                    orders[i] = self._place_limit(symbol, side, quantity, price)
                 
-                logger.logger.info(f"Scaled order placed: {symbol} {side} {quantity} @ {price}")
+                logger.logger.info("Scaled order placed: %s %s %s @ %s", symbol, side, quantity, price)
             
             return orders
             
@@ -324,16 +464,26 @@ class LimitOrderManager:
                           side: str, 
                           total_quantity: float,
                           price: float,
-                          iceberg_qty: float) -> Dict[str, Any]:
+                          iceberg_qty: float,
+                          timeout: int = 3600) -> list:
         """
         Place an iceberg order (large order split into smaller visible parts)
         
+        Futures endpoints don't accept icebergQty, so the order is emulated client-side:
+        only one child limit order of iceberg_qty (the last one takes any remainder) rests
+        on the book at a time, and the next child is placed once the previous one fills.
+        
         Args:
             symbol: Trading symbol
             side: Order side
             total_quantity: Total order quantity
             price: Limit price
             iceberg_qty: Visible quantity for each part
+            timeout: Seconds to wait for each child to fill (default: 1 hour)
+            
+        Returns:
+            Final status of each child order placed. Placement stops at the first child that
+            doesn't fill (canceled, expired, rejected or timed out); a timed-out child is left open
         """
         try:
             # Validate inputs
@@ -345,33 +495,47 @@ class LimitOrderManager:
             
             if iceberg_qty >= total_quantity:
                 raise ValueError("Iceberg quantity must be less than total quantity")
+            symbol, side = symbol.upper(), side.upper()
             
-            # Prepare order parameters
-            order_params = {
-                "symbol": symbol.upper(),
-                "side": side.upper(),
-                "type": ORDER_TYPES["LIMIT"],
-                "quantity": total_quantity,
-                "price": price,
-                "timeInForce": TIME_IN_FORCE["GTC"],
-                "icebergQty": iceberg_qty
-            }
+            # Split in Decimal so e.g. 1.0 / 0.1 gives ten full parts and no float dust
+            total_dec, part_dec = Decimal(str(total_quantity)), Decimal(str(iceberg_qty))
+            full_parts, remainder = divmod(total_dec, part_dec)
+            quantities = [iceberg_qty] * int(full_parts)
+            if remainder:
+                quantities.append(float(remainder))
             
             # Log the order attempt
-            logger.logger.info(f"Placing iceberg order: {symbol} {side} {total_quantity} @ {price} (iceberg: {iceberg_qty})")
-            
-            # Place the order
-            response = self.client.place_order(order_params)
-            
-            # Log successful order placement
-            logger.log_order_placed(order_params, response.get('orderId', 'unknown'))
+            logger.logger.info("Placing iceberg order: %s %s %s @ %s (iceberg: %s, parts: %d)",
+                               symbol, side, total_quantity, price, iceberg_qty, len(quantities))
+            
+            # Show one part at a time: the next child goes out only after the previous one fills
+            children = []
+            for part, quantity in enumerate(quantities, 1):
+                order = self._place_limit(symbol, side, quantity, price)
+                status = self.monitor_order_fill(symbol, order['orderId'], timeout)
+                children.append(status)
+                
+                if status.get('status') != 'FILLED':
+                    logger.logger.warning("Iceberg order stopped at part %d of %d: order %s is %s",
+                                          part, len(quantities), order['orderId'], status.get('status'))
+                    break
             
-            return response
+            return children
             
         except Exception as e:
             logger.log_error(e, f"Iceberg order placement failed for {symbol}")
             raise
     
+    def _acquire_order_stream(self, order_id: str, listener):
+        """Acquire the account's shared user data stream with listener registered, or None on failure"""
+        try:
+            from src.user_stream import UserDataStream
+            
+            return UserDataStream.acquire(self.client, listener)
+        except Exception as e:
+            logger.log_error(e, f"User data stream unavailable for order {order_id}, relying on polling")
+            return None
+    
     def monitor_order_fill(self, symbol: str, order_id: str, timeout: int = 3600) -> Dict[str, Any]:
         """
         Monitor an order until it's filled or timeout
@@ -383,29 +547,58 @@ class LimitOrderManager:
         """
         try:
             start_time = time.time()
-            
-            while time.time() - start_time < timeout:
-                order_status = self.client.get_order(symbol, order_id)
-                status = order_status.get('status')
-                
-                if status == 'FILLED':
-                    logger.logger.info(f"Order {order_id} filled successfully")
-                    logger.log_order_executed(order_id, order_status)
-                    return order_status
-                elif status == 'CANCELED':
-                    logger.logger.info(f"Order {order_id} was canceled")
-                    logger.log_order_cancelled(order_id, "Order was canceled")
-                    return order_status
-                elif status == 'REJECTED':
-                    logger.logger.error(f"Order {order_id} was rejected")
-                    return order_status
-                
-                # Wait before checking again
-                time.sleep(5)
-            
-            logger.logger.warning(f"Order {order_id} monitoring timed out")
+            final_updates = queue.Queue()
+            
+            def listener(order: Dict[str, Any]):
+                if str(order.get("i")) == str(order_id) and order.get("X") in FINAL_ORDER_STATUSES:
+                    final_updates.put(order)
+            
+            # While the shared user data stream is connected it delivers the final status and
+            # REST only reconciles; before it connects or while it reconnects, REST polls fast
+            stream = self._acquire_order_stream(order_id, listener)
+            delay = self.POLL_INITIAL_DELAY
+            
+            try:
+                while time.time() - start_time < timeout:
+                    order_status = self.client.get_order(symbol, order_id)
+                    status = order_status.get('status')
+                    
+                    if status == 'FILLED':
+                        logger.logger.info("Order %s filled successfully", order_id)
+                        logger.log_order_executed(order_id, order_status)
+                        return order_status
+                    elif status == 'CANCELED':
+                        logger.logger.info("Order %s was canceled", order_id)
+                        logger.log_order_cancelled(order_id, "Order was canceled")
+                        return order_status
+                    elif status == 'EXPIRED':
+                        logger.logger.info("Order %s expired", order_id)
+                        logger.log_order_cancelled(order_id, "Order expired")
+                        return order_status
+                    elif status == 'REJECTED':
+                        logger.logger.error("Order %s was rejected", order_id)
+                        return order_status
+                    
+                    if stream is not None and stream.connected:
+                        # Wait for the stream, checking REST only at the reconcile interval
+                        wait = self.RECONCILE_INTERVAL
+                        delay = self.POLL_INITIAL_DELAY
+                    else:
+                        # Back off exponentially (with jitter) before checking again
+                        wait = delay + random.uniform(0, self.POLL_JITTER)
+                        delay = min(self.POLL_MAX_DELAY, delay * self.POLL_BACKOFF)
+                    
+                    try:
+                        final_updates.get(timeout=min(wait, max(timeout - (time.time() - start_time), 0)))
+                    except queue.Empty:
+                        pass
+            finally:
+                if stream is not None:
+                    stream.release(listener)
+            
+            logger.logger.warning("Order %s monitoring timed out", order_id)
             return self.client.get_order(symbol, order_id)
             
         except Exception as e:
             logger.log_error(e, f"Order monitoring failed for {order_id}")
-            raise 
\ No newline at end of file
+            raise
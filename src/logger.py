@@ -3,20 +3,49 @@ Logging module for Binance Futures Order Bot
 Provides structured logging with timestamps and error traces
 """
 
+import atexit
 import logging
+import logging.handlers
 import json
-from datetime import datetime
+import queue
+import sys
+import time
 from typing import Dict, Any, Optional
 from pathlib import Path
 from src.config import config
 
+try:
+    import orjson  # Optional C-accelerated encoder
+except ImportError:
+    orjson = None
+
+# Console message prefix for each order placement phase
+ORDER_PHASE_MESSAGES = {
+    "attempted": "Placing order",
+    "placed": "Order placed successfully"
+}
+
 class StructuredFormatter(logging.Formatter):
     """Custom formatter for structured logging"""
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Local-time prefix for the most recent whole second, reused across records
+        self._stamp_second = None
+        self._stamp_prefix = ""
+    
+    def _timestamp(self, created: float) -> str:
+        """ISO-8601 local timestamp with millisecond precision"""
+        seconds = int(created)
+        if seconds != self._stamp_second:
+            self._stamp_second = seconds
+            self._stamp_prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(seconds))
+        return f"{self._stamp_prefix}.{int((created - seconds) * 1000):03d}"
+    
     def format(self, record):
         """Format log record with structured data"""
         log_entry = {
-            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -33,55 +62,99 @@ class StructuredFormatter(logging.Formatter):
         if hasattr(record, 'extra_data'):
             log_entry.update(record.extra_data)
         
-        return json.dumps(log_entry, ensure_ascii=False)
+        if orjson is not None:
+            return orjson.dumps(log_entry, default=str).decode('utf-8')
+        return json.dumps(log_entry, ensure_ascii=False, default=str)
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps exc_info so the listener's formatters can render it"""
+    
+    def prepare(self, record):
+        """Merge message arguments without pre-formatting the record"""
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+class LazyFileHandler(logging.FileHandler):
+    """FileHandler that creates its directory and opens the file on the first record"""
+    
+    def __init__(self, filename, encoding: Optional[str] = None):
+        super().__init__(filename, encoding=encoding, delay=True)
+    
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
 
 class BotLogger:
     """Main logger class for the trading bot"""
     
     def __init__(self, name: str = "binance_bot"):
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(getattr(logging, config.logging.log_level))
+        self.setLevel(getattr(logging, config.logging.log_level))
         
-        # Create logs directory if it doesn't exist
-        log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
-        
-        # File handler for structured logging
-        file_handler = logging.FileHandler(
-            log_dir / config.logging.log_file,
+        # File handler for structured logging (logs/ is created on the first write)
+        file_handler = LazyFileHandler(
+            Path("logs") / config.logging.log_file,
             encoding='utf-8'
         )
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(StructuredFormatter())
         
-        # Console handler for human-readable output
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_handler.setFormatter(console_formatter)
+        handlers = [file_handler]
         
-        # Add handlers if not already added
+        # Console handler for human-readable output; skipped when stderr isn't a
+        # terminal (systemd/Docker) since the file already has every record
+        if config.logging.console_enabled and sys.stderr.isatty():
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.INFO)
+            console_formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            )
+            console_handler.setFormatter(console_formatter)
+            handlers.append(console_handler)
+        
+        # Add handlers if not already added; records are written by a background
+        # listener thread so callers never block on formatting or disk I/O
+        self._listener = None
         if not self.logger.handlers:
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
+            log_queue = queue.Queue(-1)
+            self.logger.addHandler(RecordQueueHandler(log_queue))
+            self._listener = logging.handlers.QueueListener(
+                log_queue, *handlers, respect_handler_level=True
+            )
+            self._listener.start()
+            atexit.register(self._listener.stop)
+    
+    def setLevel(self, level: int):
+        """Set the logger level and refresh the cached level checks"""
+        self.logger.setLevel(level)
+        self._debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        self._info_enabled = self.logger.isEnabledFor(logging.INFO)
+        self._warning_enabled = self.logger.isEnabledFor(logging.WARNING)
     
-    def log_order_placed(self, order_data: Dict[str, Any], order_id: str):
-        """Log order placement"""
+    def log_order_placed(self, order_data: Dict[str, Any], order_id: Optional[str] = None, phase: str = "placed"):
+        """Log order placement ('attempted' before submission, 'placed' once acknowledged)"""
+        if not self._info_enabled:
+            return
         extra_data = {
             "event_type": "order_placed",
+            "phase": phase,
             "order_id": order_id,
             "symbol": order_data.get("symbol"),
             "side": order_data.get("side"),
             "order_type": order_data.get("type"),
             "quantity": order_data.get("quantity"),
-            "price": order_data.get("price")
+            "price": order_data.get("price"),
+            "stop_price": order_data.get("stopPrice")
         }
-        self.logger.info("Order placed successfully", extra={"extra_data": extra_data})
+        self.logger.info("%s: %s %s %s %s @ %s", ORDER_PHASE_MESSAGES.get(phase, phase),
+                         extra_data["symbol"], extra_data["side"], extra_data["order_type"],
+                         extra_data["quantity"], extra_data["price"], extra={"extra_data": extra_data})
     
     def log_order_executed(self, order_id: str, execution_data: Dict[str, Any]):
         """Log order execution"""
+        if not self._info_enabled:
+            return
         extra_data = {
             "event_type": "order_executed",
             "order_id": order_id,
@@ -93,6 +166,8 @@ class BotLogger:
     
     def log_order_cancelled(self, order_id: str, reason: str = ""):
         """Log order cancellation"""
+        if not self._info_enabled:
+            return
         extra_data = {
             "event_type": "order_cancelled",
             "order_id": order_id,
@@ -113,6 +188,8 @@ class BotLogger:
     
     def log_api_call(self, endpoint: str, method: str, params: Dict[str, Any] = None):
         """Log API calls"""
+        if not self._debug_enabled:
+            return
         extra_data = {
             "event_type": "api_call",
             "endpoint": endpoint,
@@ -123,37 +200,45 @@ class BotLogger:
     
     def log_validation_error(self, field: str, value: Any, message: str):
         """Log validation errors"""
+        if not self._warning_enabled:
+            return
         extra_data = {
             "event_type": "validation_error",
             "field": field,
             "value": value,
             "message": message
         }
-        self.logger.warning(f"Validation error: {message}", extra={"extra_data": extra_data})
+        self.logger.warning("Validation error: %s", message, extra={"extra_data": extra_data})
     
     def log_strategy_event(self, strategy_name: str, event: str, data: Dict[str, Any] = None):
         """Log strategy-specific events"""
+        if not self._info_enabled:
+            return
         extra_data = {
             "event_type": "strategy_event",
             "strategy": strategy_name,
             "event": event,
             "data": data or {}
         }
-        self.logger.info(f"Strategy event: {strategy_name} - {event}", 
+        self.logger.info("Strategy event: %s - %s", strategy_name, event,
                         extra={"extra_data": extra_data})
     
     def log_balance_update(self, asset: str, free: float, locked: float):
         """Log balance updates"""
+        if not self._info_enabled:
+            return
         extra_data = {
             "event_type": "balance_update",
             "asset": asset,
             "free": free,
             "locked": locked
         }
-        self.logger.info(f"Balance updated: {asset}", extra={"extra_data": extra_data})
+        self.logger.info("Balance updated: %s", asset, extra={"extra_data": extra_data})
     
     def log_position_update(self, symbol: str, side: str, size: float, entry_price: float):
         """Log position updates"""
+        if not self._info_enabled:
+            return
         extra_data = {
             "event_type": "position_update",
             "symbol": symbol,
@@ -161,7 +246,27 @@ class BotLogger:
             "size": size,
             "entry_price": entry_price
         }
-        self.logger.info(f"Position updated: {symbol}", extra={"extra_data": extra_data})
+        self.logger.info("Position updated: %s", symbol, extra={"extra_data": extra_data})
+
+# Global logger instance, created on first use so importing this module stays cheap
+_bot_logger: Optional[BotLogger] = None
+
+def get_logger() -> BotLogger:
+    """Get the global BotLogger, creating it on first use"""
+    global _bot_logger
+    if _bot_logger is None:
+        _bot_logger = BotLogger()
+    return _bot_logger
+
+class _LazyBotLogger:
+    """Stand-in for the global BotLogger that creates it on first attribute access"""
+    
+    def __getattr__(self, name: str):
+        value = getattr(get_logger(), name)
+        # Keep the resolved attribute so later lookups never reach this hook
+        setattr(self, name, value)
+        return value
 
-# Global logger instance
-logger = BotLogger() 
\ No newline at end of file
+# 'from src.logger import logger' binds this proxy, so importing a module never builds the
+# BotLogger; it is created the first time a module actually logs
+logger = _LazyBotLogger()
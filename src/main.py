@@ -4,50 +4,20 @@ Provides command-line interface for all order types and strategies
 """
 
 import argparse
+import importlib
 import sys
 import os
-from typing import Dict, Any
-from src.config import config
-from src.logger import logger
+from functools import lru_cache
+from typing import Dict, Any, Optional
 
-class BinanceBotCLI:
-    """Main CLI class for the Binance Futures Order Bot"""
-    
-    def __init__(self):
-        self.client = None
-        self.market_manager = None
-        self.limit_manager = None
-        self.oco_manager = None
-        self.twap_manager = None
-        self.grid_manager = None
-    
-    def _initialize_managers(self):
-        """Initialize managers lazily when needed"""
-        if self.client is None:
-            try:
-                from src.api_client import BinanceClient
-                from src.market_orders import MarketOrderManager
-                from src.limit_orders import LimitOrderManager
-                from src.advanced.oco import OCOOrderManager
-                from src.advanced.twap import TWAPManager
-                from src.advanced.grid_orders import GridOrderManager
-                
-                self.client = BinanceClient()
-                self.market_manager = MarketOrderManager(self.client)
-                self.limit_manager = LimitOrderManager(self.client)
-                self.oco_manager = OCOOrderManager(self.client)
-                self.twap_manager = TWAPManager(self.client)
-                self.grid_manager = GridOrderManager(self.client)
-            except Exception as e:
-                logger.log_error(e, "Failed to initialize API client")
-                raise
-    
-    def run(self):
-        """Main CLI entry point"""
-        parser = argparse.ArgumentParser(
-            description="Binance Futures Order Bot - CLI Trading Interface",
-            formatter_class=argparse.RawDescriptionHelpFormatter,
-            epilog="""
+@lru_cache(maxsize=None)
+def _logger():
+    """Import the bot logger on first use so --help and parse errors never set up logging"""
+    from src.logger import logger
+    return logger
+
+# Usage examples shown at the end of the top-level help
+EPILOG = """
 Examples:
   # Market Orders
   python src/main.py market-buy BTCUSDT 0.01
@@ -69,22 +39,162 @@ Examples:
   
   # Grid Orders
   python src/main.py grid-create BTCUSDT 55000 45000 10 1000
-            """
-        )
+"""
+
+# Help strings repeated across subcommands
+SYMBOL_HELP = 'Trading symbol (e.g., BTCUSDT)'
+QUANTITY_HELP = 'Order quantity'
+
+# Argument bundles shared by several subcommands, attached as argparse parents
+SYMBOL_QUANTITY_ARGS = argparse.ArgumentParser(add_help=False)
+SYMBOL_QUANTITY_ARGS.add_argument('symbol', help=SYMBOL_HELP)
+SYMBOL_QUANTITY_ARGS.add_argument('quantity', type=float, help=QUANTITY_HELP)
+
+MARKET_TIF_ARGS = argparse.ArgumentParser(add_help=False)
+MARKET_TIF_ARGS.add_argument('--time-in-force', default='IOC', choices=['IOC', 'FOK', 'GTC'], 
+                             help='Time in force (default: IOC)')
+
+LIMIT_PRICE_ARGS = argparse.ArgumentParser(add_help=False)
+LIMIT_PRICE_ARGS.add_argument('price', type=float, help='Limit price')
+
+LIMIT_TIF_ARGS = argparse.ArgumentParser(add_help=False)
+LIMIT_TIF_ARGS.add_argument('--time-in-force', default='GTC', choices=['GTC', 'IOC', 'FOK'], 
+                            help='Time in force (default: GTC)')
+
+OCO_PRICE_ARGS = argparse.ArgumentParser(add_help=False)
+OCO_PRICE_ARGS.add_argument('take_profit_price', type=float, help='Take profit price')
+OCO_PRICE_ARGS.add_argument('stop_loss_price', type=float, help='Stop loss trigger price')
+OCO_PRICE_ARGS.add_argument('stop_limit_price', type=float, help='Stop loss execution price')
+
+class BinanceBotCLI:
+    """Main CLI class for the Binance Futures Order Bot"""
+    
+    __slots__ = ('_client', '_managers')
+    
+    # Manager name -> (module, class); each is imported and built on first use
+    MANAGERS = {
+        'market': ('src.market_orders', 'MarketOrderManager'),
+        'limit': ('src.limit_orders', 'LimitOrderManager'),
+        'oco': ('src.advanced.oco', 'OCOOrderManager'),
+        'twap': ('src.advanced.twap', 'TWAPManager'),
+        'grid': ('src.advanced.grid_orders', 'GridOrderManager')
+    }
+    
+    # Command -> (method adding just that command's subparser, handler method)
+    COMMANDS = {
+        'market-buy': ('_add_market_buy', 'cmd_market_buy'),
+        'market-sell': ('_add_market_sell', 'cmd_market_sell'),
+        'market-buy-quote': ('_add_market_buy_quote', 'cmd_market_buy_quote'),
+        'market-sell-quote': ('_add_market_sell_quote', 'cmd_market_sell_quote'),
+        'limit-buy': ('_add_limit_buy', 'cmd_limit_buy'),
+        'limit-sell': ('_add_limit_sell', 'cmd_limit_sell'),
+        'stop-limit-buy': ('_add_stop_limit_buy', 'cmd_stop_limit_buy'),
+        'stop-limit-sell': ('_add_stop_limit_sell', 'cmd_stop_limit_sell'),
+        'oco-buy': ('_add_oco_buy', 'cmd_oco_buy'),
+        'oco-sell': ('_add_oco_sell', 'cmd_oco_sell'),
+        'twap-buy': ('_add_twap_buy', 'cmd_twap_buy'),
+        'twap-sell': ('_add_twap_sell', 'cmd_twap_sell'),
+        'grid-create': ('_add_grid_create', 'cmd_grid_create'),
+        'account': ('_add_account', 'cmd_account'),
+        'balance': ('_add_balance', 'cmd_balance'),
+        'positions': ('_add_positions', 'cmd_positions'),
+        'open-orders': ('_add_open_orders', 'cmd_open_orders'),
+        'cancel-order': ('_add_cancel_order', 'cmd_cancel_order'),
+        'cancel-all': ('_add_cancel_all', 'cmd_cancel_all'),
+        'price': ('_add_price', 'cmd_price')
+    }
+    
+    # Sniffed command (None for the full tree) -> built parser, shared across instances
+    _parsers: Dict[Optional[str], argparse.ArgumentParser] = {}
+    
+    def __init__(self):
+        self._client = None
+        self._managers = {}
+    
+    @property
+    def client(self):
+        """Lazy load the API client"""
+        if self._client is None:
+            try:
+                from src.api_client import BinanceClient
+                
+                self._client = BinanceClient()
+            except Exception as e:
+                _logger().log_error(e, "Failed to initialize API client")
+                raise
+        return self._client
+    
+    def _get_manager(self, name: str):
+        """Import and construct an order manager the first time it is needed"""
+        manager = self._managers.get(name)
+        if manager is None:
+            module_name, class_name = self.MANAGERS[name]
+            manager_class = getattr(importlib.import_module(module_name), class_name)
+            manager = self._managers[name] = manager_class(self.client)
+        return manager
+    
+    @staticmethod
+    def _sniff_subcommand():
+        """Return the subcommand named on the command line, or None for top-level help"""
+        for arg in sys.argv[1:]:
+            if arg in ('-h', '--help'):
+                return None
+            if not arg.startswith('-'):
+                return arg
+        return None
+    
+    def _build_parser(self, command: Optional[str]) -> argparse.ArgumentParser:
+        """
+        Build the argument parser for a sniffed subcommand
         
-        subparsers = parser.add_subparsers(dest='command', help='Available commands')
+        Parsers are cached per command on the class, so embedding callers that run
+        many commands in one process only build each parser once.
         
-        # Market Orders
-        self._add_market_order_parsers(subparsers)
+        Args:
+            command: Subcommand from _sniff_subcommand (None or unknown builds every subparser)
+        """
+        entry = self.COMMANDS.get(command)
+        if entry is None:
+            command = None
         
-        # Limit Orders
-        self._add_limit_order_parsers(subparsers)
+        parser = self._parsers.get(command)
+        if parser is not None:
+            return parser
         
-        # Advanced Orders
-        self._add_advanced_order_parsers(subparsers)
+        # The examples epilog is only shown by the top-level help, so it is left
+        # off whenever a known subcommand is being parsed
+        parser = argparse.ArgumentParser(
+            description="Binance Futures Order Bot - CLI Trading Interface",
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+            epilog=EPILOG if entry is None else None
+        )
         
-        # Utility Commands
-        self._add_utility_parsers(subparsers)
+        subparsers = parser.add_subparsers(dest='command', help='Available commands')
+        
+        # Build only the subparser that will run; help, no command or an unknown
+        # command get the full tree so usage and error messages stay complete
+        if entry is not None:
+            parser_builder, _ = entry
+            getattr(self, parser_builder)(subparsers)
+        else:
+            # Market Orders
+            self._add_market_order_parsers(subparsers)
+            
+            # Limit Orders
+            self._add_limit_order_parsers(subparsers)
+            
+            # Advanced Orders
+            self._add_advanced_order_parsers(subparsers)
+            
+            # Utility Commands
+            self._add_utility_parsers(subparsers)
+        
+        self._parsers[command] = parser
+        return parser
+    
+    def run(self):
+        """Main CLI entry point"""
+        parser = self._build_parser(self._sniff_subcommand())
         
         args = parser.parse_args()
         
@@ -93,113 +203,115 @@ Examples:
             return
         
         try:
-            # Initialize managers only when executing commands
-            self._initialize_managers()
-            
-            # Execute the command
-            command_method = getattr(self, f"cmd_{args.command.replace('-', '_')}")
-            command_method(args)
+            # Execute the command (the client and managers are created on first use)
+            _, handler = self.COMMANDS[args.command]
+            getattr(self, handler)(args)
         except Exception as e:
-            logger.log_error(e, f"Command execution failed: {args.command}")
+            _logger().log_error(e, f"Command execution failed: {args.command}")
             print(f"Error: {e}")
             sys.exit(1)
+        finally:
+            if self._client is not None:
+                self._client.close()
     
     def _add_market_order_parsers(self, subparsers):
         """Add market order command parsers"""
-        
-        # Market Buy
-        market_buy = subparsers.add_parser('market-buy', help='Place a market buy order')
-        market_buy.add_argument('symbol', help='Trading symbol (e.g., BTCUSDT)')
-        market_buy.add_argument('quantity', type=float, help='Order quantity')
-        market_buy.add_argument('--time-in-force', default='IOC', choices=['IOC', 'FOK', 'GTC'], 
-                               help='Time in force (default: IOC)')
-        
-        # Market Sell
-        market_sell = subparsers.add_parser('market-sell', help='Place a market sell order')
-        market_sell.add_argument('symbol', help='Trading symbol (e.g., BTCUSDT)')
-        market_sell.add_argument('quantity', type=float, help='Order quantity')
-        market_sell.add_argument('--time-in-force', default='IOC', choices=['IOC', 'FOK', 'GTC'], 
-                                help='Time in force (default: IOC)')
-        
-        # Market Buy by Quote
+        self._add_market_buy(subparsers)
+        self._add_market_sell(subparsers)
+        self._add_market_buy_quote(subparsers)
+        self._add_market_sell_quote(subparsers)
+    
+    def _add_market_buy(self, subparsers):
+        """Add the market-buy parser"""
+        subparsers.add_parser('market-buy', parents=[SYMBOL_QUANTITY_ARGS, MARKET_TIF_ARGS],
+                              help='Place a market buy order')
+    
+    def _add_market_sell(self, subparsers):
+        """Add the market-sell parser"""
+        subparsers.add_parser('market-sell', parents=[SYMBOL_QUANTITY_ARGS, MARKET_TIF_ARGS],
+                              help='Place a market sell order')
+    
+    def _add_market_buy_quote(self, subparsers):
+        """Add the market-buy-quote parser"""
         market_buy_quote = subparsers.add_parser('market-buy-quote', help='Place a market buy order using USDT amount')
-        market_buy_quote.add_argument('symbol', help='Trading symbol (e.g., BTCUSDT)')
+        market_buy_quote.add_argument('symbol', help=SYMBOL_HELP)
         market_buy_quote.add_argument('usdt_amount', type=float, help='USDT amount to spend')
-        
-        # Market Sell by Quote
+    
+    def _add_market_sell_quote(self, subparsers):
+        """Add the market-sell-quote parser"""
         market_sell_quote = subparsers.add_parser('market-sell-quote', help='Place a market sell order using USDT amount')
-        market_sell_quote.add_argument('symbol', help='Trading symbol (e.g., BTCUSDT)')
+        market_sell_quote.add_argument('symbol', help=SYMBOL_HELP)
         market_sell_quote.add_argument('usdt_amount', type=float, help='USDT amount to receive')
     
     def _add_limit_order_parsers(self, subparsers):
         """Add limit order command parsers"""
-        
-        # Limit Buy
-        limit_buy = subparsers.add_parser('limit-buy', help='Place a limit buy order')
-        limit_buy.add_argument('symbol', help='Trading symbol (e.g., BTCUSDT)')
-        limit_buy.add_argument('quantity', type=float, help='Order quantity')
-        limit_buy.add_argument('price', type=float, help='Limit price')
-        limit_buy.add_argument('--time-in-force', default='GTC', choices=['GTC', 'IOC', 'FOK'], 
-                              help='Time in force (default: GTC)')
-        
-        # Limit Sell
-        limit_sell = subparsers.add_parser('limit-sell', help='Place a limit sell order')
-        limit_sell.add_argument('symbol', help='Trading symbol (e.g., BTCUSDT)')
-        limit_sell.add_argument('quantity', type=float, help='Order quantity')
-        limit_sell.add_argument('price', type=float, help='Limit price')
-        limit_sell.add_argument('--time-in-force', default='GTC', choices=['GTC', 'IOC', 'FOK'], 
-                               help='Time in force (default: GTC)')
-        
-        # Stop-Limit Buy
-        stop_limit_buy = subparsers.add_parser('stop-limit-buy', help='Place a stop-limit buy order')
-        stop_limit_buy.add_argument('symbol', help='Trading symbol (e.g., BTCUSDT)')
-        stop_limit_buy.add_argument('quantity', type=float, help='Order quantity')
-        stop_limit_buy.add_argument('price', type=float, help='Limit price')
+        self._add_limit_buy(subparsers)
+        self._add_limit_sell(subparsers)
+        self._add_stop_limit_buy(subparsers)
+        self._add_stop_limit_sell(subparsers)
+    
+    def _add_limit_buy(self, subparsers):
+        """Add the limit-buy parser"""
+        subparsers.add_parser('limit-buy', parents=[SYMBOL_QUANTITY_ARGS, LIMIT_PRICE_ARGS, LIMIT_TIF_ARGS],
+                              help='Place a limit buy order')
+    
+    def _add_limit_sell(self, subparsers):
+        """Add the limit-sell parser"""
+        subparsers.add_parser('limit-sell', parents=[SYMBOL_QUANTITY_ARGS, LIMIT_PRICE_ARGS, LIMIT_TIF_ARGS],
+                              help='Place a limit sell order')
+    
+    def _add_stop_limit_buy(self, subparsers):
+        """Add the stop-limit-buy parser"""
+        stop_limit_buy = subparsers.add_parser('stop-limit-buy', parents=[SYMBOL_QUANTITY_ARGS, LIMIT_PRICE_ARGS],
+                                              help='Place a stop-limit buy order')
         stop_limit_buy.add_argument('stop_price', type=float, help='Stop price')
-        
-        # Stop-Limit Sell
-        stop_limit_sell = subparsers.add_parser('stop-limit-sell', help='Place a stop-limit sell order')
-        stop_limit_sell.add_argument('symbol', help='Trading symbol (e.g., BTCUSDT)')
-        stop_limit_sell.add_argument('quantity', type=float, help='Order quantity')
-        stop_limit_sell.add_argument('price', type=float, help='Limit price')
+    
+    def _add_stop_limit_sell(self, subparsers):
+        """Add the stop-limit-sell parser"""
+        stop_limit_sell = subparsers.add_parser('stop-limit-sell', parents=[SYMBOL_QUANTITY_ARGS, LIMIT_PRICE_ARGS],
+                                              help='Place a stop-limit sell order')
         stop_limit_sell.add_argument('stop_price', type=float, help='Stop price')
     
     def _add_advanced_order_parsers(self, subparsers):
         """Add advanced order command parsers"""
-        
-        # OCO Orders
-        oco_buy = subparsers.add_parser('oco-buy', help='Place an OCO buy order')
-        oco_buy.add_argument('symbol', help='Trading symbol (e.g., BTCUSDT)')
-        oco_buy.add_argument('quantity', type=float, help='Order quantity')
-        oco_buy.add_argument('take_profit_price', type=float, help='Take profit price')
-        oco_buy.add_argument('stop_loss_price', type=float, help='Stop loss trigger price')
-        oco_buy.add_argument('stop_limit_price', type=float, help='Stop loss execution price')
-        
-        oco_sell = subparsers.add_parser('oco-sell', help='Place an OCO sell order')
-        oco_sell.add_argument('symbol', help='Trading symbol (e.g., BTCUSDT)')
-        oco_sell.add_argument('quantity', type=float, help='Order quantity')
-        oco_sell.add_argument('take_profit_price', type=float, help='Take profit price')
-        oco_sell.add_argument('stop_loss_price', type=float, help='Stop loss trigger price')
-        oco_sell.add_argument('stop_limit_price', type=float, help='Stop loss execution price')
-        
-        # TWAP Orders
+        self._add_oco_buy(subparsers)
+        self._add_oco_sell(subparsers)
+        self._add_twap_buy(subparsers)
+        self._add_twap_sell(subparsers)
+        self._add_grid_create(subparsers)
+    
+    def _add_oco_buy(self, subparsers):
+        """Add the oco-buy parser"""
+        subparsers.add_parser('oco-buy', parents=[SYMBOL_QUANTITY_ARGS, OCO_PRICE_ARGS],
+                              help='Place an OCO buy order')
+    
+    def _add_oco_sell(self, subparsers):
+        """Add the oco-sell parser"""
+        subparsers.add_parser('oco-sell', parents=[SYMBOL_QUANTITY_ARGS, OCO_PRICE_ARGS],
+                              help='Place an OCO sell order')
+    
+    def _add_twap_buy(self, subparsers):
+        """Add the twap-buy parser"""
         twap_buy = subparsers.add_parser('twap-buy', help='Execute TWAP buy strategy')
-        twap_buy.add_argument('symbol', help='Trading symbol (e.g., BTCUSDT)')
+        twap_buy.add_argument('symbol', help=SYMBOL_HELP)
         twap_buy.add_argument('total_quantity', type=float, help='Total quantity to buy')
         twap_buy.add_argument('duration_seconds', type=int, help='Duration in seconds')
         twap_buy.add_argument('num_chunks', type=int, help='Number of chunks')
         twap_buy.add_argument('--use-limit-orders', action='store_true', help='Use limit orders instead of market orders')
-        
+    
+    def _add_twap_sell(self, subparsers):
+        """Add the twap-sell parser"""
         twap_sell = subparsers.add_parser('twap-sell', help='Execute TWAP sell strategy')
-        twap_sell.add_argument('symbol', help='Trading symbol (e.g., BTCUSDT)')
+        twap_sell.add_argument('symbol', help=SYMBOL_HELP)
         twap_sell.add_argument('total_quantity', type=float, help='Total quantity to sell')
         twap_sell.add_argument('duration_seconds', type=int, help='Duration in seconds')
         twap_sell.add_argument('num_chunks', type=int, help='Number of chunks')
         twap_sell.add_argument('--use-limit-orders', action='store_true', help='Use limit orders instead of market orders')
-        
-        # Grid Orders
+    
+    def _add_grid_create(self, subparsers):
+        """Add the grid-create parser"""
         grid_create = subparsers.add_parser('grid-create', help='Create a grid trading strategy')
-        grid_create.add_argument('symbol', help='Trading symbol (e.g., BTCUSDT)')
+        grid_create.add_argument('symbol', help=SYMBOL_HELP)
         grid_create.add_argument('upper_price', type=float, help='Upper price boundary')
         grid_create.add_argument('lower_price', type=float, help='Lower price boundary')
         grid_create.add_argument('grid_number', type=int, help='Number of grid levels')
@@ -209,59 +321,73 @@ Examples:
     
     def _add_utility_parsers(self, subparsers):
         """Add utility command parsers"""
-        
-        # Account Info
-        account = subparsers.add_parser('account', help='Get account information')
-        
-        # Balance
-        balance = subparsers.add_parser('balance', help='Get account balance')
-        
-        # Positions
+        self._add_account(subparsers)
+        self._add_balance(subparsers)
+        self._add_positions(subparsers)
+        self._add_open_orders(subparsers)
+        self._add_cancel_order(subparsers)
+        self._add_cancel_all(subparsers)
+        self._add_price(subparsers)
+    
+    def _add_account(self, subparsers):
+        """Add the account parser"""
+        subparsers.add_parser('account', help='Get account information')
+    
+    def _add_balance(self, subparsers):
+        """Add the balance parser"""
+        subparsers.add_parser('balance', help='Get account balance')
+    
+    def _add_positions(self, subparsers):
+        """Add the positions parser"""
         positions = subparsers.add_parser('positions', help='Get position information')
         positions.add_argument('--symbol', help='Specific symbol (optional)')
-        
-        # Open Orders
+    
+    def _add_open_orders(self, subparsers):
+        """Add the open-orders parser"""
         open_orders = subparsers.add_parser('open-orders', help='Get open orders')
         open_orders.add_argument('--symbol', help='Specific symbol (optional)')
-        
-        # Cancel Order
+    
+    def _add_cancel_order(self, subparsers):
+        """Add the cancel-order parser"""
         cancel_order = subparsers.add_parser('cancel-order', help='Cancel a specific order')
         cancel_order.add_argument('symbol', help='Trading symbol')
         cancel_order.add_argument('order_id', help='Order ID to cancel')
-        
-        # Cancel All Orders
+    
+    def _add_cancel_all(self, subparsers):
+        """Add the cancel-all parser"""
         cancel_all = subparsers.add_parser('cancel-all', help='Cancel all open orders for a symbol')
         cancel_all.add_argument('symbol', help='Trading symbol')
-        
-        # Price
+    
+    def _add_price(self, subparsers):
+        """Add the price parser"""
         price = subparsers.add_parser('price', help='Get current price for a symbol')
         price.add_argument('symbol', help='Trading symbol')
     
     # Market Order Commands
     def cmd_market_buy(self, args):
         """Execute market buy command"""
-        result = self.market_manager.market_order.place_market_buy_order(
+        result = self._get_manager('market').market_order.place_market_buy_order(
             args.symbol, args.quantity, time_in_force=args.time_in_force
         )
         print(f"Market buy order placed: {result}")
     
     def cmd_market_sell(self, args):
         """Execute market sell command"""
-        result = self.market_manager.market_order.place_market_sell_order(
+        result = self._get_manager('market').market_order.place_market_sell_order(
             args.symbol, args.quantity, time_in_force=args.time_in_force
         )
         print(f"Market sell order placed: {result}")
     
     def cmd_market_buy_quote(self, args):
         """Execute market buy by quote command"""
-        result = self.market_manager.market_order.place_market_buy_by_quote(
+        result = self._get_manager('market').market_order.place_market_buy_by_quote(
             args.symbol, args.usdt_amount
         )
         print(f"Market buy order placed: {result}")
     
     def cmd_market_sell_quote(self, args):
         """Execute market sell by quote command"""
-        result = self.market_manager.market_order.place_market_sell_by_quote(
+        result = self._get_manager('market').market_order.place_market_sell_by_quote(
             args.symbol, args.usdt_amount
         )
         print(f"Market sell order placed: {result}")
@@ -269,28 +395,28 @@ Examples:
     # Limit Order Commands
     def cmd_limit_buy(self, args):
         """Execute limit buy command"""
-        result = self.limit_manager.limit_order.place_limit_buy_order(
+        result = self._get_manager('limit').limit_order.place_limit_buy_order(
             args.symbol, args.quantity, args.price, time_in_force=args.time_in_force
         )
         print(f"Limit buy order placed: {result}")
     
     def cmd_limit_sell(self, args):
         """Execute limit sell command"""
-        result = self.limit_manager.limit_order.place_limit_sell_order(
+        result = self._get_manager('limit').limit_order.place_limit_sell_order(
             args.symbol, args.quantity, args.price, time_in_force=args.time_in_force
         )
         print(f"Limit sell order placed: {result}")
     
     def cmd_stop_limit_buy(self, args):
         """Execute stop-limit buy command"""
-        result = self.limit_manager.limit_order.place_stop_limit_order(
+        result = self._get_manager('limit').limit_order.place_stop_limit_order(
             args.symbol, 'BUY', args.quantity, args.price, args.stop_price
         )
         print(f"Stop-limit buy order placed: {result}")
     
     def cmd_stop_limit_sell(self, args):
         """Execute stop-limit sell command"""
-        result = self.limit_manager.limit_order.place_stop_limit_order(
+        result = self._get_manager('limit').limit_order.place_stop_limit_order(
             args.symbol, 'SELL', args.quantity, args.price, args.stop_price
         )
         print(f"Stop-limit sell order placed: {result}")
@@ -298,7 +424,7 @@ Examples:
     # Advanced Order Commands
     def cmd_oco_buy(self, args):
         """Execute OCO buy command"""
-        result = self.oco_manager.oco_order.place_oco_buy_order(
+        result = self._get_manager('oco').oco_order.place_oco_buy_order(
             args.symbol, args.quantity, args.take_profit_price, 
             args.stop_loss_price, args.stop_limit_price
         )
@@ -306,7 +432,7 @@ Examples:
     
     def cmd_oco_sell(self, args):
         """Execute OCO sell command"""
-        result = self.oco_manager.oco_order.place_oco_sell_order(
+        result = self._get_manager('oco').oco_order.place_oco_sell_order(
             args.symbol, args.quantity, args.take_profit_price, 
             args.stop_loss_price, args.stop_limit_price
         )
@@ -314,7 +440,7 @@ Examples:
     
     def cmd_twap_buy(self, args):
         """Execute TWAP buy command"""
-        result = self.twap_manager.twap_order.execute_twap_strategy(
+        result = self._get_manager('twap').twap_order.execute_twap_strategy(
             args.symbol, 'BUY', args.total_quantity, args.duration_seconds, 
             args.num_chunks, use_limit_orders=args.use_limit_orders
         )
@@ -322,7 +448,7 @@ Examples:
     
     def cmd_twap_sell(self, args):
         """Execute TWAP sell command"""
-        result = self.twap_manager.twap_order.execute_twap_strategy(
+        result = self._get_manager('twap').twap_order.execute_twap_strategy(
             args.symbol, 'SELL', args.total_quantity, args.duration_seconds, 
             args.num_chunks, use_limit_orders=args.use_limit_orders
         )
@@ -330,7 +456,7 @@ Examples:
     
     def cmd_grid_create(self, args):
         """Execute grid create command"""
-        result = self.grid_manager.grid_order.create_grid_strategy(
+        result = self._get_manager('grid').grid_order.create_grid_strategy(
             args.symbol, args.upper_price, args.lower_price, 
             args.grid_number, args.total_investment, args.grid_type
         )
@@ -349,12 +475,12 @@ Examples:
     
     def cmd_positions(self, args):
         """Get position information"""
-        result = self.client.get_position_info(args.symbol if hasattr(args, 'symbol') else None)
+        result = self.client.get_position_info(args.symbol)
         print(f"Positions: {result}")
     
     def cmd_open_orders(self, args):
         """Get open orders"""
-        result = self.client.get_open_orders(args.symbol if hasattr(args, 'symbol') else None)
+        result = self.client.get_open_orders(args.symbol)
         print(f"Open Orders: {result}")
     
     def cmd_cancel_order(self, args):
@@ -381,7 +507,7 @@ def main():
         print("\nOperation cancelled by user")
         sys.exit(0)
     except Exception as e:
-        logger.log_error(e, "CLI execution failed")
+        _logger().log_error(e, "CLI execution failed")
         print(f"Fatal error: {e}")
         sys.exit(1)
 
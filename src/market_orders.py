@@ -3,16 +3,46 @@ Market Orders module for Binance Futures Order Bot
 Handles market order placement, execution, and management
 """
 
+import math
 import time
-from typing import Dict, Any, Optional
-from src.config import config, ORDER_TYPES, SIDE_TYPES
+import requests
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, List
+from src.config import config, ORDER_TYPES, SIDE_TYPES, MAX_BATCH_ORDERS, BOOL_PARAMS
 from src.logger import logger
 from src.validator import validator, ValidationError
 from src.api_client import BinanceClient
 
+def _dca_schedule(total_amount: float, num_orders: int) -> List[float]:
+    """
+    Split a DCA budget into per-order USDT amounts
+    
+    Every order gets total_amount / num_orders rounded to 8 decimals; the last one
+    absorbs the rounding residual so the amounts add up to total_amount.
+    """
+    if num_orders < 1:
+        raise ValueError("Number of orders must be at least 1")
+    
+    schedule = [round(total_amount / num_orders, 8)] * (num_orders - 1)
+    schedule.append(round(total_amount - math.fsum(schedule), 8))
+    return schedule
+
 class MarketOrder:
     """Market order implementation"""
     
+    __slots__ = ('client',)
+    
+    _SIDE_BUY = SIDE_TYPES["BUY"]
+    _SIDE_SELL = SIDE_TYPES["SELL"]
+    _TYPE_MARKET = ORDER_TYPES["MARKET"]
+    
+    # Fields shared by every single market order; copied and filled in per call
+    _BASE_PARAMS = {
+        "type": _TYPE_MARKET,
+        "reduceOnly": BOOL_PARAMS[False],
+        "closeOnTrigger": BOOL_PARAMS[False]
+    }
+    
     def __init__(self, client: BinanceClient):
         self.client = client
     
@@ -22,7 +52,8 @@ class MarketOrder:
                           quantity: float,
                           time_in_force: str = "IOC",
                           reduce_only: bool = False,
-                          close_on_trigger: bool = False) -> Dict[str, Any]:
+                          close_on_trigger: bool = False,
+                          new_order_resp_type: Optional[str] = None) -> Dict[str, Any]:
         """
         Place a market order
         
@@ -33,30 +64,33 @@ class MarketOrder:
             time_in_force: Time in force ('IOC', 'FOK', 'GTC')
             reduce_only: Whether to reduce position only
             close_on_trigger: Whether to close position on trigger
+            new_order_resp_type: Response type ('ACK' or 'RESULT'); RESULT includes
+                                 status, executedQty and avgPrice
             
         Returns:
             Order response from Binance API
         """
         try:
-            # Validate inputs
-            validator.validate_symbol(symbol)
-            validator.validate_side(side)
-            quantity = validator.validate_quantity(quantity)
-            validator.validate_time_in_force(time_in_force)
+            # Validate inputs (returns the normalised values)
+            symbol, side, quantity, time_in_force = validator.validate_market_order(
+                symbol, side, quantity, time_in_force
+            )
             
             # Prepare order parameters
-            order_params = {
-                "symbol": symbol.upper(),
-                "side": side.upper(),
-                "type": ORDER_TYPES["MARKET"],
-                "quantity": quantity,
-                "timeInForce": time_in_force.upper(),
-                "reduceOnly": reduce_only,
-                "closeOnTrigger": close_on_trigger
-            }
+            order_params = self._BASE_PARAMS.copy()
+            order_params["symbol"] = symbol
+            order_params["side"] = side
+            order_params["quantity"] = quantity
+            order_params["timeInForce"] = time_in_force
+            if reduce_only:
+                order_params["reduceOnly"] = BOOL_PARAMS[True]
+            if close_on_trigger:
+                order_params["closeOnTrigger"] = BOOL_PARAMS[True]
+            if new_order_resp_type:
+                order_params["newOrderRespType"] = new_order_resp_type.upper()
             
             # Log the order attempt
-            logger.logger.info(f"Placing market order: {symbol} {side} {quantity}")
+            logger.logger.info("Placing market order: %s %s %s", symbol, side, quantity)
             
             # Place the order
             response = self.client.place_order(order_params)
@@ -78,14 +112,66 @@ class MarketOrder:
                               quantity: float,
                               **kwargs) -> Dict[str, Any]:
         """Place a market buy order"""
-        return self.place_market_order(symbol, SIDE_TYPES["BUY"], quantity, **kwargs)
+        return self.place_market_order(symbol, self._SIDE_BUY, quantity, **kwargs)
     
     def place_market_sell_order(self, 
                                symbol: str, 
                                quantity: float,
                                **kwargs) -> Dict[str, Any]:
         """Place a market sell order"""
-        return self.place_market_order(symbol, SIDE_TYPES["SELL"], quantity, **kwargs)
+        return self.place_market_order(symbol, self._SIDE_SELL, quantity, **kwargs)
+    
+    def place_batch_market_orders(self,
+                                  orders: list,
+                                  new_order_resp_type: Optional[str] = None) -> list:
+        """
+        Place several market orders using the batch endpoint
+        
+        Args:
+            orders: List of dicts with 'symbol', 'side' and 'quantity'
+            new_order_resp_type: Response type applied to every order ('ACK' or 'RESULT')
+            
+        Returns:
+            One response per order, in input order. Orders that were rejected
+            (or whose batch request failed) have 'code' and 'msg' instead of 'orderId'
+        """
+        batch = []
+        for order in orders:
+            symbol = order.get('symbol')
+            side = order.get('side')
+            
+            validator.validate_symbol(symbol)
+            validator.validate_side(side)
+            
+            order_params = {
+                "symbol": symbol.upper(),
+                "side": side.upper(),
+                "type": self._TYPE_MARKET,
+                "quantity": str(validator.validate_quantity(order.get('quantity')))
+            }
+            if new_order_resp_type:
+                order_params["newOrderRespType"] = new_order_resp_type.upper()
+            batch.append(order_params)
+        
+        responses = []
+        for start in range(0, len(batch), MAX_BATCH_ORDERS):
+            chunk = batch[start:start + MAX_BATCH_ORDERS]
+            
+            logger.logger.info("Placing batch of %d market orders", len(chunk))
+            
+            try:
+                chunk_responses = self.client.place_batch_orders(chunk)
+            except Exception as e:
+                logger.log_error(e, f"Batch market order placement failed for {len(chunk)} orders")
+                chunk_responses = [{"code": None, "msg": str(e)} for _ in chunk]
+            
+            for order_params, response in zip(chunk, chunk_responses):
+                if 'orderId' in response:
+                    logger.log_order_placed(order_params, response['orderId'])
+            
+            responses.extend(chunk_responses)
+        
+        return responses
     
     def place_market_order_by_quote_quantity(self,
                                            symbol: str,
@@ -126,14 +212,14 @@ class MarketOrder:
                                  usdt_amount: float,
                                  **kwargs) -> Dict[str, Any]:
         """Place a market buy order using USDT amount"""
-        return self.place_market_order_by_quote_quantity(symbol, SIDE_TYPES["BUY"], usdt_amount, **kwargs)
+        return self.place_market_order_by_quote_quantity(symbol, self._SIDE_BUY, usdt_amount, **kwargs)
     
     def place_market_sell_by_quote(self, 
                                   symbol: str, 
                                   usdt_amount: float,
                                   **kwargs) -> Dict[str, Any]:
         """Place a market sell order using USDT amount"""
-        return self.place_market_order_by_quote_quantity(symbol, SIDE_TYPES["SELL"], usdt_amount, **kwargs)
+        return self.place_market_order_by_quote_quantity(symbol, self._SIDE_SELL, usdt_amount, **kwargs)
     
     def get_order_status(self, symbol: str, order_id: str) -> Dict[str, Any]:
         """Get the status of a specific order"""
@@ -144,7 +230,7 @@ class MarketOrder:
             
             # Log order status
             status = response.get('status', 'unknown')
-            logger.logger.info(f"Order {order_id} status: {status}")
+            logger.logger.info("Order %s status: %s", order_id, status)
             
             return response
             
@@ -178,7 +264,7 @@ class MarketOrder:
             
             # Log open orders count
             count = len(response)
-            logger.logger.info(f"Retrieved {count} open orders for {symbol or 'all symbols'}")
+            logger.logger.info("Retrieved %d open orders for %s", count, symbol or 'all symbols')
             
             return response
             
@@ -195,7 +281,7 @@ class MarketOrder:
             
             # Log cancellation
             cancelled_count = len(response.get('cancelledOrders', []))
-            logger.logger.info(f"Cancelled {cancelled_count} orders for {symbol}")
+            logger.logger.info("Cancelled %d orders for %s", cancelled_count, symbol)
             
             return response
             
@@ -206,6 +292,8 @@ class MarketOrder:
 class MarketOrderManager:
     """Manager for market order operations"""
     
+    __slots__ = ('client', 'market_order')
+    
     def __init__(self, client: BinanceClient):
         self.client = client
         self.market_order = MarketOrder(client)
@@ -244,7 +332,7 @@ class MarketOrderManager:
                         slippage = abs(avg_price - price_before) / price_before
                         
                         if slippage > max_slippage:
-                            logger.logger.warning(f"High slippage detected: {slippage:.4f} for {symbol}")
+                            logger.logger.warning("High slippage detected: %.4f for %s", slippage, symbol)
                         
                         # Log execution
                         logger.log_order_executed(order_id, {
@@ -259,6 +347,24 @@ class MarketOrderManager:
             logger.log_error(e, f"Quick trade execution failed for {symbol}")
             raise
     
+    def start_dca_strategy(self, 
+                         symbol: str, 
+                         total_amount: float,
+                         num_orders: int,
+                         interval_seconds: int = 300) -> Future:
+        """
+        Run a DCA strategy in the background on the client's worker pool
+        
+        Several strategies can run side by side this way while the caller stays free.
+        Arguments are the same as execute_dca_strategy.
+        
+        Returns:
+            Future resolving to the list of placed orders
+        """
+        return self.client.executor.submit(
+            self.execute_dca_strategy, symbol, total_amount, num_orders, interval_seconds
+        )
+    
     def execute_dca_strategy(self, 
                            symbol: str, 
                            total_amount: float,
@@ -275,27 +381,32 @@ class MarketOrderManager:
         """
         try:
             orders = []
-            amount_per_order = total_amount / num_orders
+            schedule = _dca_schedule(total_amount, num_orders)
             
-            logger.logger.info(f"Starting DCA strategy: {symbol}, {num_orders} orders, {interval_seconds}s intervals")
+            logger.logger.info("Starting DCA strategy: %s, %d orders, %ss intervals", symbol, num_orders, interval_seconds)
             
-            for i in range(num_orders):
+            errors = []
+            start = time.monotonic()
+            for i, amount in enumerate(schedule):
                 try:
                     # Place market buy order
-                    order = self.market_order.place_market_buy_by_quote(symbol, amount_per_order)
+                    order = self.market_order.place_market_buy_by_quote(symbol, amount)
+                except (requests.exceptions.RequestException, ValidationError) as e:
+                    # The order layer has already logged the details; continue with remaining orders
+                    errors.append((i, e))
+                else:
                     orders.append(order)
-                    
-                    logger.logger.info(f"DCA order {i+1}/{num_orders} placed: {order.get('orderId')}")
-                    
-                    # Wait for next order (except for the last one)
-                    if i < num_orders - 1:
-                        time.sleep(interval_seconds)
-                        
-                except Exception as e:
-                    logger.log_error(e, f"DCA order {i+1} failed")
-                    # Continue with remaining orders
+                    logger.logger.info("DCA order %d/%d placed: %s", i + 1, num_orders, order.get('orderId'))
+                
+                # Wait for next order (except for the last one), against the fixed schedule
+                # so order latency doesn't push every later order back
+                if i < num_orders - 1:
+                    time.sleep(max(0.0, start + (i + 1) * interval_seconds - time.monotonic()))
+            
+            for i, e in errors:
+                logger.log_error(e, f"DCA order {i+1} failed")
             
-            logger.logger.info(f"DCA strategy completed: {len(orders)} orders placed")
+            logger.logger.info("DCA strategy completed: %d orders placed", len(orders))
             return orders
             
         except Exception as e:
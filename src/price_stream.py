@@ -0,0 +1,100 @@
+"""
+Price Stream module for Binance Futures Order Bot
+Caches the latest best bid/ask per symbol from the public WebSocket book ticker stream
+"""
+
+import json
+import time
+import threading
+from typing import Dict, Optional, Tuple
+import websocket
+from src.config import config
+from src.logger import logger
+
+class PriceStream:
+    """Public bookTicker streams keeping the latest bid/ask for each subscribed symbol"""
+
+    # Prices older than this (seconds) are treated as unavailable
+    DEFAULT_MAX_AGE = 1.0
+
+    def __init__(self):
+        self._books: Dict[str, Tuple[float, float, float]] = {}  # symbol -> (bid, ask, monotonic time)
+        self._streams: Dict[str, websocket.WebSocketApp] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, symbol: str):
+        """Start streaming book ticker updates for a symbol (no-op if already subscribed)"""
+        symbol = symbol.upper()
+        with self._lock:
+            if symbol in self._streams:
+                return
+
+            ws = websocket.WebSocketApp(
+                f"{config.binance.stream_url}/ws/{symbol.lower()}@bookTicker",
+                on_message=self._on_message,
+                on_error=self._on_error
+            )
+            self._streams[symbol] = ws
+
+        threading.Thread(target=ws.run_forever, daemon=True).start()
+        logger.log_strategy_event("PriceStream", "subscribed", {"symbol": symbol})
+
+    def unsubscribe(self, symbol: str):
+        """Close a symbol's stream and drop its cached quote"""
+        symbol = symbol.upper()
+        with self._lock:
+            ws = self._streams.pop(symbol, None)
+            self._books.pop(symbol, None)
+
+        if ws is not None:
+            ws.close()
+            logger.log_strategy_event("PriceStream", "unsubscribed", {"symbol": symbol})
+
+    def stop(self):
+        """Close every open stream"""
+        for symbol in list(self._streams):
+            self.unsubscribe(symbol)
+
+    def get_price(self, symbol: str, max_age: float = DEFAULT_MAX_AGE) -> Optional[float]:
+        """
+        Get the latest mid price for a symbol
+
+        Args:
+            symbol: Trading symbol
+            max_age: Maximum age of the price in seconds
+
+        Returns:
+            Mid price, or None if the symbol has no price younger than max_age
+        """
+        book = self.get_book(symbol, max_age)
+        if book is None:
+            return None
+        return (book[0] + book[1]) / 2
+
+    def get_book(self, symbol: str, max_age: float = DEFAULT_MAX_AGE) -> Optional[Tuple[float, float]]:
+        """
+        Get the best bid and ask for a symbol
+
+        Args:
+            symbol: Trading symbol
+            max_age: Maximum age of the quote in seconds
+
+        Returns:
+            (bid, ask), or None if the symbol has no quote younger than max_age
+        """
+        entry = self._books.get(symbol.upper())
+        if entry is None or time.monotonic() - entry[2] > max_age:
+            return None
+        return entry[0], entry[1]
+
+    def _on_message(self, ws, message: str):
+        """Store the best bid and ask from a bookTicker event"""
+        try:
+            event = json.loads(message)
+            self._books[event["s"]] = (float(event["b"]), float(event["a"]), time.monotonic())
+        except Exception as e:
+            logger.log_error(e, "Failed to handle price stream message")
+
+    def _on_error(self, ws, error: Exception):
+        """Log WebSocket errors"""
+        logger.log_error(error, "Price stream error")
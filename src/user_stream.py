@@ -0,0 +1,193 @@
+"""
+User Data Stream module for Binance Futures Order Bot
+Receives order updates over WebSocket instead of polling the REST API
+"""
+
+import json
+import threading
+from typing import Dict, Any, Callable, Optional, Tuple
+import websocket
+from src.config import config
+from src.logger import logger
+from src.api_client import BinanceClient
+
+class UserDataStream:
+    """Binance Futures user data stream delivering ORDER_TRADE_UPDATE events"""
+
+    # Listen keys expire after 60 minutes without a keepalive
+    KEEPALIVE_INTERVAL = 30 * 60
+
+    # Backoff between reconnect attempts after the socket drops (seconds)
+    RECONNECT_INITIAL_DELAY = 1.0
+    RECONNECT_MAX_DELAY = 30.0
+
+    # Binance allows one listen key per account, so consumers share one stream per
+    # account through acquire()/release(); keyed by (base_url, api_key)
+    _shared: Dict[Tuple[str, str], "UserDataStream"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, client: BinanceClient):
+        self.client = client
+        self.listen_key = None
+        self._order_listeners: Tuple[Callable[[Dict[str, Any]], None], ...] = ()
+        self._listeners_lock = threading.Lock()
+        self._users = 0
+        self._ws = None
+        self._ws_thread = None
+        self._keepalive_thread = None
+        self._stopped = threading.Event()
+        self._connected = threading.Event()
+
+    @classmethod
+    def acquire(cls, client: BinanceClient,
+                listener: Optional[Callable[[Dict[str, Any]], None]] = None) -> "UserDataStream":
+        """
+        Get the account's shared stream, starting it for the first user
+
+        Args:
+            client: API client of the account
+            listener: Optional order listener to register (see add_order_listener)
+
+        Returns:
+            The shared stream; every acquire() must be paired with a release()
+        """
+        key = (client.base_url, client.api_key)
+        with cls._shared_lock:
+            stream = cls._shared.get(key)
+            if stream is None:
+                stream = cls(client)
+                stream.start()
+                cls._shared[key] = stream
+            stream._users += 1
+
+        if listener is not None:
+            stream.add_order_listener(listener)
+        return stream
+
+    def release(self, listener: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """Unregister listener (if given) and drop one reference; the last user stops the stream"""
+        if listener is not None:
+            self.remove_order_listener(listener)
+
+        with self._shared_lock:
+            self._users -= 1
+            if self._users > 0:
+                return
+            self._shared.pop((self.client.base_url, self.client.api_key), None)
+            # Stopped under the lock so a concurrent acquire() can't reuse the key being closed
+            self.stop()
+
+    @property
+    def connected(self) -> bool:
+        """Whether the WebSocket is currently open"""
+        return self._connected.is_set()
+
+    def wait_connected(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for the WebSocket to open; returns whether it is open"""
+        return self._connected.wait(timeout)
+
+    def add_order_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """
+        Register a callback for order updates
+
+        Args:
+            callback: Called with the order payload ('o' field) of every
+                      ORDER_TRADE_UPDATE event, from the stream thread
+        """
+        with self._listeners_lock:
+            self._order_listeners += (callback,)
+
+    def remove_order_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Unregister a callback added with add_order_listener"""
+        with self._listeners_lock:
+            self._order_listeners = tuple(cb for cb in self._order_listeners if cb is not callback)
+
+    def start(self):
+        """Open the stream and start the WebSocket and keepalive threads"""
+        self.listen_key = self.client.start_user_stream()
+        self._stopped.clear()
+
+        self._ws_thread = threading.Thread(target=self._run, daemon=True)
+        self._ws_thread.start()
+
+        self._keepalive_thread = threading.Thread(target=self._keepalive, daemon=True)
+        self._keepalive_thread.start()
+
+        logger.log_strategy_event("UserDataStream", "started", {"stream_url": config.binance.stream_url})
+
+    def stop(self):
+        """Close the WebSocket and the listen key"""
+        self._stopped.set()
+
+        if self._ws is not None:
+            self._ws.close()
+
+        if self.listen_key is not None:
+            try:
+                self.client.close_user_stream()
+            except Exception as e:
+                logger.log_error(e, "Failed to close user data stream")
+            self.listen_key = None
+
+        logger.log_strategy_event("UserDataStream", "stopped")
+
+    def _run(self):
+        """Keep the WebSocket connected until stop(), reconnecting with backoff when it drops"""
+        delay = self.RECONNECT_INITIAL_DELAY
+        while not self._stopped.is_set():
+            self._ws = websocket.WebSocketApp(
+                f"{config.binance.stream_url}/ws/{self.listen_key}",
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error
+            )
+            if self._stopped.is_set():
+                break
+            self._ws.run_forever()
+
+            # run_forever returns once the socket closes; a connection that opened resets the backoff
+            if self._connected.is_set():
+                delay = self.RECONNECT_INITIAL_DELAY
+            self._connected.clear()
+
+            if self._stopped.is_set():
+                break
+            logger.logger.warning("User data stream disconnected, reconnecting in %.1fs", delay)
+            if self._stopped.wait(delay):
+                break
+            delay = min(self.RECONNECT_MAX_DELAY, delay * 2)
+
+            # The listen key may have expired while disconnected; this returns the active one
+            try:
+                self.listen_key = self.client.start_user_stream()
+            except Exception as e:
+                logger.log_error(e, "Failed to renew user data stream listen key")
+
+    def _keepalive(self):
+        """Refresh the listen key until the stream is stopped"""
+        while not self._stopped.wait(self.KEEPALIVE_INTERVAL):
+            try:
+                self.client.keepalive_user_stream()
+            except Exception as e:
+                logger.log_error(e, "User data stream keepalive failed")
+
+    def _on_open(self, ws):
+        """Signal that updates are now being received"""
+        self._connected.set()
+
+    def _on_message(self, ws, message: str):
+        """Dispatch ORDER_TRADE_UPDATE events to the registered listeners"""
+        try:
+            event = json.loads(message)
+            if event.get("e") != "ORDER_TRADE_UPDATE":
+                return
+
+            order = event["o"]
+            for callback in self._order_listeners:
+                callback(order)
+        except Exception as e:
+            logger.log_error(e, "Failed to handle user data stream message")
+
+    def _on_error(self, ws, error: Exception):
+        """Log WebSocket errors"""
+        logger.log_error(error, "User data stream error")
@@ -3,295 +3,360 @@ Validation module for Binance Futures Order Bot
 Validates inputs (symbol, quantity, price thresholds) with comprehensive error handling
 """
 
-import re
+import math
+from functools import lru_cache, wraps
 from typing import Dict, Any, Optional, Tuple
-from decimal import Decimal, InvalidOperation
-from src.config import SUPPORTED_SYMBOLS, ORDER_TYPES, SIDE_TYPES, TIME_IN_FORCE
+from src.config import SUPPORTED_SYMBOLS, SUPPORTED_SYMBOLS_SET, ORDER_TYPES, SIDE_TYPES, TIME_IN_FORCE
 from src.logger import logger
 
+# Reasonable upper limit for quantities and prices
+_MAX_NUMERIC = 1_000_000.0
+
+# Required price fields per order type, on top of symbol, side and quantity
+ORDER_PARAM_PRICE_FIELDS = {
+    'market': (),
+    'limit': ('price',),
+    'stop_limit': ('price', 'stopPrice'),
+    'oco': ('price', 'stopPrice', 'stopLimitPrice')
+}
+
+# Allowed values as shown in error messages
+_SUPPORTED_SYMBOLS_MSG = ', '.join(SUPPORTED_SYMBOLS)
+_SIDES_MSG = ', '.join(SIDE_TYPES)
+_ORDER_TYPES_MSG = ', '.join(ORDER_TYPES)
+_TIME_IN_FORCE_MSG = ', '.join(TIME_IN_FORCE)
+_ORDER_PARAM_TYPES_MSG = ', '.join(ORDER_PARAM_PRICE_FIELDS)
+
+def _fail(field: str, value: Any, message: str, error_message: Optional[str] = None):
+    """Log a validation failure and raise ValidationError (error_message defaults to message)"""
+    logger.log_validation_error(field, value, message)
+    raise ValidationError(error_message or message)
+
+def _required(params: Dict[str, Any], field: str) -> Any:
+    """Look up a required order parameter, failing validation when it is missing"""
+    try:
+        return params[field]
+    except KeyError:
+        _fail(field, None, f"{field} is required")
+
+def _convert(value: Any, cast, field: str, message: str):
+    """
+    Convert value with cast (int or float), failing validation with message if it cannot be
+    
+    Bools and non-finite numbers are rejected, and int only accepts integral values
+    instead of truncating them.
+    """
+    if isinstance(value, bool):
+        _fail(field, value, message)
+    
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        _fail(field, value, message)
+    
+    if not math.isfinite(number) or (cast is int and not number.is_integer()):
+        _fail(field, value, message)
+    
+    return cast(number)
+
+def _canonical(value: str, allowed) -> str:
+    """Uppercase value only when it is not already one of the allowed spellings"""
+    return value if value in allowed else value.upper()
+
 class ValidationError(Exception):
     """Custom exception for validation errors"""
     pass
 
+def _memoized(check):
+    """
+    Cache successful results of a check that depends on its arguments alone
+    
+    Unhashable arguments can't be cached, so those run the check uncached and
+    fail validation instead of raising TypeError.
+    """
+    cached = lru_cache(maxsize=512)(check)
+    
+    @wraps(check)
+    def wrapper(*args):
+        try:
+            return cached(*args)
+        except TypeError:
+            return check(*args)
+    
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+def _positive_float(value: Any, field: str, allow_zero: bool = False) -> float:
+    """Convert a numeric field to float and check it is positive and below _MAX_NUMERIC"""
+    label = field.capitalize()
+    if value is None:
+        _fail(field, value, f"{label} cannot be None")
+    
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        _fail(field, value, f"{label} must be a valid number")
+    
+    if not allow_zero and number <= 0:
+        _fail(field, number, f"{label} must be positive")
+    
+    if number > _MAX_NUMERIC:
+        _fail(field, number, f"{label} too large",
+              f"{label} too large (max: 1,000,000)")
+    
+    return number
+
+@_memoized
+def _check_symbol(symbol: str) -> bool:
+    """Validate trading symbol"""
+    if not symbol:
+        _fail("symbol", symbol, "Symbol cannot be empty")
+    
+    if not isinstance(symbol, str):
+        _fail("symbol", symbol, "Symbol must be a string")
+    
+    symbol = _canonical(symbol, SUPPORTED_SYMBOLS_SET)
+    
+    # The whitelist only holds well-formed symbols, so it also rejects malformed input
+    if symbol not in SUPPORTED_SYMBOLS_SET:
+        _fail("symbol", symbol, f"Symbol {symbol} not supported",
+              f"Symbol {symbol} not supported. Supported symbols: {_SUPPORTED_SYMBOLS_MSG}")
+    
+    return True
+
+@_memoized
+def _check_side(side: str) -> bool:
+    """Validate order side"""
+    if not side:
+        _fail("side", side, "Side cannot be empty")
+    
+    if not isinstance(side, str):
+        _fail("side", side, "Side must be a string")
+    
+    side = _canonical(side, SIDE_TYPES)
+    
+    if side not in SIDE_TYPES:
+        _fail("side", side, f"Invalid side: {side}",
+              f"Invalid side: {side}. Must be one of: {_SIDES_MSG}")
+    
+    return True
+
+@_memoized
+def _check_order_type(order_type: str) -> bool:
+    """Validate order type"""
+    if not order_type:
+        _fail("order_type", order_type, "Order type cannot be empty")
+    
+    if not isinstance(order_type, str):
+        _fail("order_type", order_type, "Order type must be a string")
+    
+    order_type = _canonical(order_type, ORDER_TYPES)
+    
+    if order_type not in ORDER_TYPES:
+        _fail("order_type", order_type, f"Invalid order type: {order_type}",
+              f"Invalid order type: {order_type}. Must be one of: {_ORDER_TYPES_MSG}")
+    
+    return True
+
+@_memoized
+def _check_price(price: Any, allow_zero: bool) -> float:
+    """Validate and convert price to float"""
+    return _positive_float(price, "price", allow_zero)
+
+@_memoized
+def _check_time_in_force(time_in_force: str) -> bool:
+    """Validate time in force parameter"""
+    if not time_in_force:
+        _fail("time_in_force", time_in_force, "Time in force cannot be empty")
+    
+    if not isinstance(time_in_force, str):
+        _fail("time_in_force", time_in_force, "Time in force must be a string")
+    
+    time_in_force = _canonical(time_in_force, TIME_IN_FORCE)
+    
+    if time_in_force not in TIME_IN_FORCE:
+        _fail("time_in_force", time_in_force, f"Invalid time in force: {time_in_force}",
+              f"Invalid time in force: {time_in_force}. Must be one of: {_TIME_IN_FORCE_MSG}")
+    
+    return True
+
 class OrderValidator:
     """Validator for order parameters"""
     
-    def __init__(self):
-        self.symbol_pattern = re.compile(r'^[A-Z0-9]+$')
-        self.price_pattern = re.compile(r'^\d+(\.\d+)?$')
-        self.quantity_pattern = re.compile(r'^\d+(\.\d+)?$')
+    # Stateless: no per-instance __dict__
+    __slots__ = ()
     
     def validate_symbol(self, symbol: str) -> bool:
-        """Validate trading symbol"""
-        if not symbol:
-            logger.log_validation_error("symbol", symbol, "Symbol cannot be empty")
-            raise ValidationError("Symbol cannot be empty")
-        
-        if not isinstance(symbol, str):
-            logger.log_validation_error("symbol", symbol, "Symbol must be a string")
-            raise ValidationError("Symbol must be a string")
-        
-        symbol = symbol.upper()
-        
-        if not self.symbol_pattern.match(symbol):
-            logger.log_validation_error("symbol", symbol, "Invalid symbol format")
-            raise ValidationError("Invalid symbol format")
-        
-        if symbol not in SUPPORTED_SYMBOLS:
-            logger.log_validation_error("symbol", symbol, f"Symbol {symbol} not supported")
-            raise ValidationError(f"Symbol {symbol} not supported. Supported symbols: {', '.join(SUPPORTED_SYMBOLS)}")
-        
-        return True
+        """Validate trading symbol (successful results are cached)"""
+        return _check_symbol(symbol)
     
     def validate_side(self, side: str) -> bool:
-        """Validate order side"""
-        if not side:
-            logger.log_validation_error("side", side, "Side cannot be empty")
-            raise ValidationError("Side cannot be empty")
-        
-        side = side.upper()
-        
-        if side not in SIDE_TYPES:
-            logger.log_validation_error("side", side, f"Invalid side: {side}")
-            raise ValidationError(f"Invalid side: {side}. Must be one of: {', '.join(SIDE_TYPES.keys())}")
-        
-        return True
+        """Validate order side (successful results are cached)"""
+        return _check_side(side)
     
     def validate_order_type(self, order_type: str) -> bool:
-        """Validate order type"""
-        if not order_type:
-            logger.log_validation_error("order_type", order_type, "Order type cannot be empty")
-            raise ValidationError("Order type cannot be empty")
-        
-        order_type = order_type.upper()
-        
-        if order_type not in ORDER_TYPES:
-            logger.log_validation_error("order_type", order_type, f"Invalid order type: {order_type}")
-            raise ValidationError(f"Invalid order type: {order_type}. Must be one of: {', '.join(ORDER_TYPES.keys())}")
-        
-        return True
+        """Validate order type (successful results are cached)"""
+        return _check_order_type(order_type)
     
     def validate_quantity(self, quantity: Any) -> float:
         """Validate and convert quantity to float"""
-        if quantity is None:
-            logger.log_validation_error("quantity", quantity, "Quantity cannot be None")
-            raise ValidationError("Quantity cannot be None")
-        
-        try:
-            quantity_float = float(quantity)
-        except (ValueError, TypeError):
-            logger.log_validation_error("quantity", quantity, "Quantity must be a valid number")
-            raise ValidationError("Quantity must be a valid number")
-        
-        if quantity_float <= 0:
-            logger.log_validation_error("quantity", quantity_float, "Quantity must be positive")
-            raise ValidationError("Quantity must be positive")
-        
-        if quantity_float > 1000000:  # Reasonable upper limit
-            logger.log_validation_error("quantity", quantity_float, "Quantity too large")
-            raise ValidationError("Quantity too large (max: 1,000,000)")
-        
-        return quantity_float
+        return _positive_float(quantity, "quantity")
     
     def validate_price(self, price: Any, allow_zero: bool = False) -> float:
-        """Validate and convert price to float"""
-        if price is None:
-            logger.log_validation_error("price", price, "Price cannot be None")
-            raise ValidationError("Price cannot be None")
-        
-        try:
-            price_float = float(price)
-        except (ValueError, TypeError):
-            logger.log_validation_error("price", price, "Price must be a valid number")
-            raise ValidationError("Price must be a valid number")
-        
-        if not allow_zero and price_float <= 0:
-            logger.log_validation_error("price", price_float, "Price must be positive")
-            raise ValidationError("Price must be positive")
-        
-        if price_float > 1000000:  # Reasonable upper limit
-            logger.log_validation_error("price", price_float, "Price too large")
-            raise ValidationError("Price too large (max: 1,000,000)")
-        
-        return price_float
+        """Validate and convert price to float (successful results are cached)"""
+        return _check_price(price, allow_zero)
     
-    def validate_time_in_force(self, time_in_force: str) -> bool:
-        """Validate time in force parameter"""
-        if not time_in_force:
-            logger.log_validation_error("time_in_force", time_in_force, "Time in force cannot be empty")
-            raise ValidationError("Time in force cannot be empty")
-        
-        time_in_force = time_in_force.upper()
-        
-        if time_in_force not in TIME_IN_FORCE:
-            logger.log_validation_error("time_in_force", time_in_force, f"Invalid time in force: {time_in_force}")
-            raise ValidationError(f"Invalid time in force: {time_in_force}. Must be one of: {', '.join(TIME_IN_FORCE.keys())}")
-        
-        return True
+    # Stop, take-profit and stop-loss prices follow the same rules as limit prices
+    validate_stop_price = validate_price
+    validate_take_profit_price = validate_price
+    validate_stop_loss_price = validate_price
     
-    def validate_stop_price(self, stop_price: Any) -> float:
-        """Validate stop price for stop orders"""
-        return self.validate_price(stop_price)
-    
-    def validate_take_profit_price(self, take_profit_price: Any) -> float:
-        """Validate take profit price"""
-        return self.validate_price(take_profit_price)
-    
-    def validate_stop_loss_price(self, stop_loss_price: Any) -> float:
-        """Validate stop loss price"""
-        return self.validate_price(stop_loss_price)
+    def validate_time_in_force(self, time_in_force: str) -> bool:
+        """Validate time in force parameter (successful results are cached)"""
+        return _check_time_in_force(time_in_force)
     
     def validate_leverage(self, leverage: Any) -> int:
         """Validate leverage value"""
         if leverage is None:
-            logger.log_validation_error("leverage", leverage, "Leverage cannot be None")
-            raise ValidationError("Leverage cannot be None")
+            _fail("leverage", leverage, "Leverage cannot be None")
         
         try:
             leverage_int = int(leverage)
         except (ValueError, TypeError):
-            logger.log_validation_error("leverage", leverage, "Leverage must be an integer")
-            raise ValidationError("Leverage must be an integer")
+            _fail("leverage", leverage, "Leverage must be an integer")
         
         if leverage_int < 1 or leverage_int > 125:
-            logger.log_validation_error("leverage", leverage_int, "Leverage must be between 1 and 125")
-            raise ValidationError("Leverage must be between 1 and 125")
+            _fail("leverage", leverage_int, "Leverage must be between 1 and 125")
         
         return leverage_int
     
-    def validate_market_order_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Validate market order parameters"""
-        validated_params = {}
-        
-        # Required fields
-        validated_params['symbol'] = params.get('symbol')
-        validated_params['side'] = params.get('side')
-        validated_params['quantity'] = params.get('quantity')
-        
-        # Validate required fields
-        self.validate_symbol(validated_params['symbol'])
-        self.validate_side(validated_params['side'])
-        validated_params['quantity'] = self.validate_quantity(validated_params['quantity'])
+    def validate_market_order(self, symbol: str, side: str, quantity: Any,
+                              time_in_force: str) -> Tuple[str, str, float, str]:
+        """
+        Validate the fields of a single market order in one call
+        
+        Returns:
+            (symbol, side, quantity, time_in_force) with the strings uppercased
+            and the quantity converted to float
+        """
+        self.validate_symbol(symbol)
+        self.validate_side(side)
+        quantity = self.validate_quantity(quantity)
+        self.validate_time_in_force(time_in_force)
+        return (_canonical(symbol, SUPPORTED_SYMBOLS_SET), _canonical(side, SIDE_TYPES),
+                quantity, _canonical(time_in_force, TIME_IN_FORCE))
+    
+    def validate_order_params(self, order_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate order parameters against the schema for an order type
+        
+        Args:
+            order_type: One of the keys of ORDER_PARAM_PRICE_FIELDS
+            params: Order parameters (symbol, side, quantity, optional timeInForce and the type's prices)
+        
+        Returns:
+            Validated parameters with symbol/side/timeInForce uppercased and numbers converted to float
+        """
+        price_fields = ORDER_PARAM_PRICE_FIELDS.get(order_type)
+        if price_fields is None:
+            _fail("order_type", order_type, f"Invalid order type: {order_type}",
+                  f"Invalid order type: {order_type}. Must be one of: {_ORDER_PARAM_TYPES_MSG}")
+        
+        symbol = _required(params, 'symbol')
+        side = _required(params, 'side')
+        self.validate_symbol(symbol)
+        self.validate_side(side)
+        validated_params = {
+            'symbol': _canonical(symbol, SUPPORTED_SYMBOLS_SET),
+            'side': _canonical(side, SIDE_TYPES),
+            'quantity': self.validate_quantity(_required(params, 'quantity'))
+        }
         
         # Optional fields
         if 'timeInForce' in params:
             self.validate_time_in_force(params['timeInForce'])
-            validated_params['timeInForce'] = params['timeInForce'].upper()
+            validated_params['timeInForce'] = _canonical(params['timeInForce'], TIME_IN_FORCE)
+        
+        # Stop and stop-limit prices follow the same rules as limit prices
+        validate_price = self.validate_price
+        for field in price_fields:
+            validated_params[field] = validate_price(_required(params, field))
         
         return validated_params
     
+    def validate_market_order_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate market order parameters"""
+        return self.validate_order_params('market', params)
+    
     def validate_limit_order_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Validate limit order parameters"""
-        validated_params = self.validate_market_order_params(params)
-        
-        # Additional required field for limit orders
-        validated_params['price'] = params.get('price')
-        validated_params['price'] = self.validate_price(validated_params['price'])
-        
-        return validated_params
+        return self.validate_order_params('limit', params)
     
     def validate_stop_limit_order_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Validate stop-limit order parameters"""
-        validated_params = self.validate_limit_order_params(params)
-        
-        # Additional required field for stop-limit orders
-        validated_params['stopPrice'] = params.get('stopPrice')
-        validated_params['stopPrice'] = self.validate_stop_price(validated_params['stopPrice'])
-        
-        return validated_params
+        return self.validate_order_params('stop_limit', params)
     
     def validate_oco_order_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Validate OCO order parameters"""
-        validated_params = {}
-        
-        # Required fields
-        validated_params['symbol'] = params.get('symbol')
-        validated_params['side'] = params.get('side')
-        validated_params['quantity'] = params.get('quantity')
-        validated_params['price'] = params.get('price')
-        validated_params['stopPrice'] = params.get('stopPrice')
-        validated_params['stopLimitPrice'] = params.get('stopLimitPrice')
-        
-        # Validate required fields
-        self.validate_symbol(validated_params['symbol'])
-        self.validate_side(validated_params['side'])
-        validated_params['quantity'] = self.validate_quantity(validated_params['quantity'])
-        validated_params['price'] = self.validate_price(validated_params['price'])
-        validated_params['stopPrice'] = self.validate_stop_price(validated_params['stopPrice'])
-        validated_params['stopLimitPrice'] = self.validate_price(validated_params['stopLimitPrice'])
-        
-        # Optional fields
-        if 'timeInForce' in params:
-            self.validate_time_in_force(params['timeInForce'])
-            validated_params['timeInForce'] = params['timeInForce'].upper()
-        
-        return validated_params
+        return self.validate_order_params('oco', params)
     
     def validate_twap_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Validate TWAP order parameters"""
-        validated_params = {}
-        
-        # Required fields
-        validated_params['symbol'] = params.get('symbol')
-        validated_params['side'] = params.get('side')
-        validated_params['totalQuantity'] = params.get('totalQuantity')
-        validated_params['duration'] = params.get('duration')  # in seconds
-        validated_params['chunks'] = params.get('chunks')
-        
-        # Validate required fields
-        self.validate_symbol(validated_params['symbol'])
-        self.validate_side(validated_params['side'])
-        validated_params['totalQuantity'] = self.validate_quantity(validated_params['totalQuantity'])
+        symbol = _required(params, 'symbol')
+        side = _required(params, 'side')
+        self.validate_symbol(symbol)
+        self.validate_side(side)
+        total_quantity = self.validate_quantity(_required(params, 'totalQuantity'))
         
-        # Validate duration
-        duration = validated_params['duration']
-        if not isinstance(duration, (int, float)) or duration <= 0:
-            logger.log_validation_error("duration", duration, "Duration must be a positive number")
-            raise ValidationError("Duration must be a positive number")
+        # Validate duration (in seconds)
+        duration = _convert(_required(params, 'duration'), float, "duration", "Duration must be a positive number")
+        if duration <= 0:
+            _fail("duration", duration, "Duration must be a positive number")
         
         # Validate chunks
-        chunks = validated_params['chunks']
-        if not isinstance(chunks, int) or chunks < 1:
-            logger.log_validation_error("chunks", chunks, "Chunks must be a positive integer")
-            raise ValidationError("Chunks must be a positive integer")
-        
-        return validated_params
+        chunks = _convert(_required(params, 'chunks'), int, "chunks", "Chunks must be a positive integer")
+        if chunks < 1:
+            _fail("chunks", chunks, "Chunks must be a positive integer")
+        
+        return {
+            'symbol': _canonical(symbol, SUPPORTED_SYMBOLS_SET),
+            'side': _canonical(side, SIDE_TYPES),
+            'totalQuantity': total_quantity,
+            'duration': duration,
+            'chunks': chunks
+        }
     
     def validate_grid_order_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Validate grid order parameters"""
-        validated_params = {}
-        
-        # Required fields
-        validated_params['symbol'] = params.get('symbol')
-        validated_params['upperPrice'] = params.get('upperPrice')
-        validated_params['lowerPrice'] = params.get('lowerPrice')
-        validated_params['gridNumber'] = params.get('gridNumber')
-        validated_params['totalInvestment'] = params.get('totalInvestment')
-        
-        # Validate required fields
-        self.validate_symbol(validated_params['symbol'])
-        validated_params['upperPrice'] = self.validate_price(validated_params['upperPrice'])
-        validated_params['lowerPrice'] = self.validate_price(validated_params['lowerPrice'])
+        symbol = _required(params, 'symbol')
+        self.validate_symbol(symbol)
+        upper_price = self.validate_price(_required(params, 'upperPrice'))
+        lower_price = self.validate_price(_required(params, 'lowerPrice'))
         
         # Validate price range
-        if validated_params['upperPrice'] <= validated_params['lowerPrice']:
-            logger.log_validation_error("price_range", f"{validated_params['lowerPrice']}-{validated_params['upperPrice']}", 
-                                      "Upper price must be greater than lower price")
-            raise ValidationError("Upper price must be greater than lower price")
+        if upper_price <= lower_price:
+            _fail("price_range", f"{lower_price}-{upper_price}",
+                  "Upper price must be greater than lower price")
         
         # Validate grid number
-        grid_number = validated_params['gridNumber']
-        if not isinstance(grid_number, int) or grid_number < 2:
-            logger.log_validation_error("gridNumber", grid_number, "Grid number must be at least 2")
-            raise ValidationError("Grid number must be at least 2")
+        grid_number = _convert(_required(params, 'gridNumber'), int, "gridNumber", "Grid number must be an integer")
+        if grid_number < 2:
+            _fail("gridNumber", grid_number, "Grid number must be at least 2")
         
         # Validate total investment
-        total_investment = validated_params['totalInvestment']
-        if not isinstance(total_investment, (int, float)) or total_investment <= 0:
-            logger.log_validation_error("totalInvestment", total_investment, "Total investment must be positive")
-            raise ValidationError("Total investment must be positive")
-        
-        return validated_params
+        total_investment = _convert(_required(params, 'totalInvestment'), float, "totalInvestment",
+                                    "Total investment must be positive")
+        if total_investment <= 0:
+            _fail("totalInvestment", total_investment, "Total investment must be positive")
+        
+        return {
+            'symbol': _canonical(symbol, SUPPORTED_SYMBOLS_SET),
+            'upperPrice': upper_price,
+            'lowerPrice': lower_price,
+            'gridNumber': grid_number,
+            'totalInvestment': total_investment
+        }
 
 # Global validator instance
 validator = OrderValidator() 
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""Tests for the grid price and quantity helpers"""
+
+import pytest
+from src.advanced.grid_orders import _grid_prices, _snap_to_ticks, _floor_to_step
+from src.validator import ValidationError
+
+def test_arithmetic_grid_prices_are_evenly_spaced():
+    assert _grid_prices(110.0, 100.0, 5, "arithmetic") == pytest.approx((100.0, 102.5, 105.0, 107.5, 110.0))
+
+def test_geometric_grid_prices_have_constant_ratio():
+    prices = _grid_prices(400.0, 100.0, 3, "geometric")
+    assert prices == pytest.approx((100.0, 200.0, 400.0))
+
+@pytest.mark.parametrize("grid_type", ["arithmetic", "geometric"])
+def test_grid_prices_pin_endpoints_exactly(grid_type):
+    prices = _grid_prices(0.3, 0.1, 7, grid_type)
+    assert len(prices) == 7
+    assert prices[0] == 0.1
+    assert prices[-1] == 0.3
+
+def test_grid_prices_reject_unknown_type():
+    with pytest.raises(ValidationError):
+        _grid_prices(110.0, 100.0, 5, "fibonacci")
+
+def test_snap_to_ticks_rounds_to_nearest_tick():
+    assert _snap_to_ticks([100.04, 100.06, 0.3], "0.1") == [1000, 1001, 3]
+
+def test_floor_to_step_rounds_down_without_float_dust():
+    assert _floor_to_step(0.3, "0.1") == 0.3
+    assert _floor_to_step(1.23456, "0.001") == 1.234
+    assert _floor_to_step(0.0009, "0.001") == 0.0
@@ -0,0 +1,17 @@
+"""Tests for the DCA schedule helper"""
+
+import math
+import pytest
+from src.market_orders import _dca_schedule
+
+def test_dca_schedule_splits_evenly():
+    assert _dca_schedule(100.0, 4) == [25.0, 25.0, 25.0, 25.0]
+
+def test_dca_schedule_last_order_absorbs_rounding():
+    schedule = _dca_schedule(100.0, 3)
+    assert schedule[:2] == [33.33333333, 33.33333333]
+    assert math.fsum(schedule) == pytest.approx(100.0, abs=1e-8)
+
+def test_dca_schedule_rejects_zero_orders():
+    with pytest.raises(ValueError):
+        _dca_schedule(100.0, 0)
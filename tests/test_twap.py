@@ -0,0 +1,29 @@
+"""Tests for the TWAP scheduling helpers"""
+
+import pytest
+from src.advanced.twap import _chunk_intervals, _batch_schedule, TWAP_BATCH_WINDOW
+
+def test_chunk_intervals_without_randomize():
+    assert _chunk_intervals(4, 10.0, False) == [0.0, 10.0, 10.0, 10.0]
+
+def test_chunk_intervals_single_chunk_runs_immediately():
+    assert _chunk_intervals(1, 10.0, True) == [0.0]
+
+def test_randomized_chunk_intervals_keep_total_duration():
+    intervals = _chunk_intervals(20, 5.0, True)
+    assert len(intervals) == 20
+    assert intervals[0] == 0.0
+    assert sum(intervals) == pytest.approx(5.0 * 19)
+    assert all(interval > 0 for interval in intervals[1:])
+
+def test_batch_schedule_keeps_spaced_chunks_separate():
+    assert _batch_schedule([0.0, 1.0, 1.0], 5) == [(0.0, 1), (1.0, 1), (1.0, 1)]
+
+def test_batch_schedule_merges_chunks_inside_window():
+    short = TWAP_BATCH_WINDOW / 2
+    assert _batch_schedule([0.0, short, short, 1.0], 5) == [(0.0, 3), (1.0 + 2 * short, 1)]
+
+def test_batch_schedule_respects_max_batch_size():
+    schedule = _batch_schedule([0.0] * 5, 2)
+    assert [count for _, count in schedule] == [2, 2, 1]
+    assert sum(wait for wait, _ in schedule) == 0.0
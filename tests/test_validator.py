@@ -0,0 +1,46 @@
+"""Tests for order parameter validation"""
+
+import pytest
+from src.validator import validator, ValidationError
+
+BASE_PARAMS = {'symbol': 'btcusdt', 'side': 'buy', 'quantity': '0.01'}
+
+def test_market_params_are_normalized():
+    assert validator.validate_order_params('market', BASE_PARAMS) == {
+        'symbol': 'BTCUSDT', 'side': 'BUY', 'quantity': 0.01
+    }
+
+def test_oco_params_require_every_price():
+    params = dict(BASE_PARAMS, price='101', stopPrice='99', stopLimitPrice='98.5', timeInForce='gtc')
+    assert validator.validate_order_params('oco', params) == {
+        'symbol': 'BTCUSDT', 'side': 'BUY', 'quantity': 0.01, 'timeInForce': 'GTC',
+        'price': 101.0, 'stopPrice': 99.0, 'stopLimitPrice': 98.5
+    }
+    
+    del params['stopLimitPrice']
+    with pytest.raises(ValidationError, match="stopLimitPrice is required"):
+        validator.validate_order_params('oco', params)
+
+@pytest.mark.parametrize("field, value", [
+    ('symbol', 'FOOBAR'),
+    ('symbol', ['BTCUSDT']),
+    ('side', 'HOLD'),
+    ('quantity', 0),
+    ('quantity', 'abc'),
+    ('price', [1]),
+    ('price', -5),
+])
+def test_invalid_params_raise_validation_error(field, value):
+    params = {**BASE_PARAMS, 'price': '100', field: value}
+    with pytest.raises(ValidationError):
+        validator.validate_order_params('limit', params)
+
+@pytest.mark.parametrize("chunks", [1.5, True, 'nan', 0])
+def test_twap_chunks_must_be_a_positive_integer(chunks):
+    params = {'symbol': 'BTCUSDT', 'side': 'BUY', 'totalQuantity': 1, 'duration': 60, 'chunks': chunks}
+    with pytest.raises(ValidationError):
+        validator.validate_twap_params(params)
+
+def test_unknown_order_type_raises_validation_error():
+    with pytest.raises(ValidationError, match="Invalid order type: twap"):
+        validator.validate_order_params('twap', BASE_PARAMS)